@@ -0,0 +1,56 @@
+"""
+Benchmark of the end of game scoring (`CarcassonneGame.handleEnd`) on big boards
+
+Run from the repository root::
+
+    python -m benchmarks.end_scoring
+
+Plays random games on the default tileset with every tile count multiplied by `COPIES`
+and prints how long scoring the open features took
+"""
+from logic.headless import DEFAULT_TILESET, RandomPolicy, play_turn
+from logic.game import CarcassonneGame
+from logic.seeding import BOTS, make_rng
+import os
+import tempfile
+import time
+
+COPIES = 8
+GAMES = 5
+
+
+def write_big_tileset(path: str, copies: int) -> None:
+    """Write the default tileset with every count multiplied by `copies`"""
+    with open(DEFAULT_TILESET, "r") as f:
+        lines = [line.split(" ") for line in f.read().splitlines() if line.strip()]
+    with open(path, "w") as f:
+        for arr in lines:
+            if arr[0] == "S":
+                arr = ["S", str(int(arr[1]) * copies)] + arr[2:]
+            else:
+                arr = [str(int(arr[0]) * copies)] + arr[1:]
+            f.write(" ".join(arr) + "\n")
+
+
+def main() -> None:
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "tileset")
+        write_big_tileset(path, COPIES)
+
+        for seed in range(GAMES):
+            game = CarcassonneGame.from_file_and_names(path, ["a", "b", "c"], seed)
+            policy = RandomPolicy(make_rng(seed, BOTS, 0))
+            while not game.is_finished():
+                play_turn(game, policy)
+
+            start = time.perf_counter()
+            game.handleEnd()
+            elapsed = time.perf_counter() - start
+            print(
+                f"seed {seed}: {len(game.board)} tiles, "
+                f"{len(game.regions.regions)} regions, end scoring {elapsed * 1000:.2f} ms"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,39 @@
+"""
+Benchmark of game records: encoding, decoding and replaying random games
+
+Run from the repository root::
+
+    python -m benchmarks.replay
+"""
+from logic.headless import DEFAULT_TILESET, RandomPolicy, run_game
+from logic.record import decode_record, encode_record, get_record, replay
+from logic.seeding import BOTS, make_rng
+import time
+
+GAMES = 50
+PLAYERS = 3
+
+
+def main() -> None:
+    data = []
+    for seed in range(GAMES):
+        policies = [RandomPolicy(make_rng(seed, BOTS, seat)) for seat in range(PLAYERS)]
+        data.append(encode_record(get_record(run_game(seed, policies))))
+
+    start = time.perf_counter()
+    records = [decode_record(record) for record in data]
+    decoding = time.perf_counter() - start
+    moves = sum(len(record.moves) for record in records)
+
+    start = time.perf_counter()
+    for record in records:
+        replay(record, DEFAULT_TILESET)
+    replaying = time.perf_counter() - start
+
+    print(f"{moves} moves in {sum(len(record) for record in data)} bytes")
+    print(f"decoding:  {moves / decoding:12.0f} moves/s")
+    print(f"replaying: {moves / replaying:12.0f} moves/s")
+
+
+if __name__ == "__main__":
+    main()
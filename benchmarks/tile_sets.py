@@ -0,0 +1,77 @@
+"""
+Regression benchmark: operations on sets of tiles must take constant time however many tiles there are
+
+Run from the repository root::
+
+    python -m benchmarks.tile_sets
+
+Exits with status 1 if an operation on the largest set is more than `MAX_SLOWDOWN` times slower
+than on the smallest one (with constant hashing it grows linearly with the size of the set)
+"""
+from logic.headless import DEFAULT_TILESET
+from logic.tile import Tile
+from logic.tileset import load_tileset
+import sys
+import timeit
+
+SIZES = (100, 1000, 10000)
+MAX_SLOWDOWN = 3.0
+REPEAT = 5
+
+
+def make_tiles(n: int) -> list[Tile]:
+    types = load_tileset(DEFAULT_TILESET).types
+    return [Tile(None, types[i % len(types)]) for i in range(n)]
+
+
+def measure(n: int) -> dict[str, float]:
+    """Nanoseconds per operation on a set of `n` tiles"""
+    tiles = make_tiles(n)
+    others = make_tiles(100)
+    members = tiles[:100]
+    tile_set = set(tiles)
+
+    def add_discard():
+        for tile in others:
+            tile_set.add(tile)
+        for tile in others:
+            tile_set.discard(tile)
+
+    def contains():
+        for tile in members:
+            tile in tile_set
+        for tile in others:
+            tile in tile_set
+
+    def update():
+        tile_set.update(others)
+        tile_set.difference_update(others)
+
+    results = dict()
+    for name, op, count in (
+        ("add+discard", add_discard, len(others)),
+        ("contains", contains, len(members) + len(others)),
+        ("update", update, len(others)),
+    ):
+        best = min(timeit.repeat(op, number=100, repeat=REPEAT))
+        results[name] = best / (100 * count) * 1e9
+    return results
+
+
+def main() -> int:
+    results = {n: measure(n) for n in SIZES}
+    failed = False
+    for name in results[SIZES[0]]:
+        times = [results[n][name] for n in SIZES]
+        slowdown = times[-1] / max(times[0], 1.0)
+        print(
+            f"{name:12}"
+            + "".join(f"{n:>8}: {t:8.1f} ns" for n, t in zip(SIZES, times))
+            + f"   x{slowdown:.2f}"
+        )
+        failed = failed or slowdown > MAX_SLOWDOWN
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,182 @@
+from logic.utils import Coords
+from typing import TYPE_CHECKING, Iterator
+
+if TYPE_CHECKING:
+    from logic.tile import Tile
+
+SIDE_OFFSETS = ((-1, 0), (0, -1), (1, 0), (0, 1))
+"""Offsets of the neighbors on the 4 sides, in the order of sides (the same as `Coords.get_adjacent_coords`)"""
+
+MARGIN = 2
+"""Number of cells kept around every placed tile, so neighbors of the tiles and of their empty neighbors are always inside the grid"""
+
+
+class Board(object):
+    """
+    Tiles on the board, stored in a dense grid that grows when a tile is placed near its border
+
+    Lookups by position are plain index arithmetic on the grid (no hashing and no `Coords` objects),
+    the grid doubles its size when it grows, so growing costs amortized O(1) per tile.
+    Also works like a dict mapping `Coords` to tiles (`in`, `[]`, `keys`, `values`, `items`, `pop`)
+
+    Attributes
+    ----------
+    x0 : int
+        x coordinate of the first column of the grid
+    y0 : int
+        y coordinate of the first row of the grid
+    width : int
+        Number of columns of the grid
+    height : int
+        Number of rows of the grid
+    """
+
+    __slots__ = ("x0", "y0", "width", "height", "_cells", "_placed")
+
+    def __init__(self, size: int = 16) -> None:
+        self.x0 = -(size // 2)
+        self.y0 = -(size // 2)
+        self.width = size
+        self.height = size
+        self._cells = [None] * (size * size)
+        self._placed = dict()
+
+    def _index(self, x: int, y: int) -> int:
+        """Index of the cell in the grid (-1 if it is outside of the grid)"""
+        x -= self.x0
+        y -= self.y0
+        if 0 <= x < self.width and 0 <= y < self.height:
+            return y * self.width + x
+        return -1
+
+    def _grow(self, x: int, y: int) -> None:
+        """Make the grid big enough for (x, y) with the margin around it"""
+        x_min = min(self.x0, x - MARGIN)
+        y_min = min(self.y0, y - MARGIN)
+        x_max = max(self.x0 + self.width, x + MARGIN + 1)
+        y_max = max(self.y0 + self.height, y + MARGIN + 1)
+        if (x_min, y_min, x_max, y_max) == (
+            self.x0,
+            self.y0,
+            self.x0 + self.width,
+            self.y0 + self.height,
+        ):
+            return
+
+        # at least double the grown dimension, extending it on the side that ran out
+        if x_max - x_min > self.width:
+            extra = max(x_max - x_min, 2 * self.width) - (x_max - x_min)
+            if x_min < self.x0:
+                x_min -= extra
+            else:
+                x_max += extra
+        if y_max - y_min > self.height:
+            extra = max(y_max - y_min, 2 * self.height) - (y_max - y_min)
+            if y_min < self.y0:
+                y_min -= extra
+            else:
+                y_max += extra
+
+        width = x_max - x_min
+        cells = [None] * (width * (y_max - y_min))
+        for row in range(self.height):
+            start = (row + self.y0 - y_min) * width + self.x0 - x_min
+            cells[start : start + self.width] = self._cells[
+                row * self.width : (row + 1) * self.width
+            ]
+
+        self.x0 = x_min
+        self.y0 = y_min
+        self.width = width
+        self.height = y_max - y_min
+        self._cells = cells
+
+    def get_at(self, x: int, y: int) -> "Tile":
+        """Get the tile at (x, y) (None if there is no tile)"""
+        index = self._index(x, y)
+        if index < 0:
+            return None
+        return self._cells[index]
+
+    def neighbors(self, x: int, y: int) -> tuple:
+        """Get the tiles on the 4 sides of (x, y) in the order of sides (None where there is no tile)"""
+        x -= self.x0
+        y -= self.y0
+        width = self.width
+        if 1 <= x < width - 1 and 1 <= y < self.height - 1:
+            cells = self._cells
+            index = y * width + x
+            return (
+                cells[index - 1],
+                cells[index - width],
+                cells[index + 1],
+                cells[index + width],
+            )
+        x += self.x0
+        y += self.y0
+        return tuple(self.get_at(x + dx, y + dy) for dx, dy in SIDE_OFFSETS)
+
+    def count_around(self, x: int, y: int) -> int:
+        """Count the tiles in the 3x3 square centered at (x, y) (including the center)"""
+        x -= self.x0
+        y -= self.y0
+        width = self.width
+        cells = self._cells
+        count = 0
+        for row in range(max(y - 1, 0), min(y + 2, self.height)):
+            start = row * width
+            for column in range(max(x - 1, 0), min(x + 2, width)):
+                if cells[start + column] is not None:
+                    count += 1
+        return count
+
+    def __contains__(self, coords: Coords) -> bool:
+        return self.get_at(coords.x, coords.y) is not None
+
+    def __getitem__(self, coords: Coords) -> "Tile":
+        tile = self.get_at(coords.x, coords.y)
+        if tile is None:
+            raise KeyError(coords)
+        return tile
+
+    def get(self, coords: Coords, default=None) -> "Tile":
+        tile = self.get_at(coords.x, coords.y)
+        return default if tile is None else tile
+
+    def __setitem__(self, coords: Coords, tile: "Tile") -> None:
+        index = self._index(coords.x, coords.y)
+        if (
+            index < 0
+            or not MARGIN <= coords.x - self.x0 < self.width - MARGIN
+            or not MARGIN <= coords.y - self.y0 < self.height - MARGIN
+        ):
+            self._grow(coords.x, coords.y)
+            index = self._index(coords.x, coords.y)
+        if self._cells[index] is not None:
+            del self._placed[coords]
+        self._cells[index] = tile
+        self._placed[coords] = tile
+
+    def pop(self, coords: Coords) -> "Tile":
+        """Remove the tile at the given coords and return it"""
+        tile = self._placed.pop(coords)
+        self._cells[self._index(coords.x, coords.y)] = None
+        return tile
+
+    def keys(self):
+        return self._placed.keys()
+
+    def values(self):
+        return self._placed.values()
+
+    def items(self):
+        return self._placed.items()
+
+    def __iter__(self) -> Iterator[Coords]:
+        return iter(self._placed)
+
+    def __len__(self) -> int:
+        return len(self._placed)
+
+    def __repr__(self):
+        return f"Board[{len(self._placed)} tiles;{self.width}x{self.height} from ({self.x0}, {self.y0})]"
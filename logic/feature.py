@@ -1,8 +1,11 @@
 from typing import TYPE_CHECKING, Sequence
-import uuid
+from logic.trace import get_tracer, TRACE
 
 if TYPE_CHECKING:
     from logic.player import Player
+    from logic.regions import Region
+
+_trace = get_tracer("logic.feature")
 
 
 class Connection(object):
@@ -17,17 +20,12 @@ class Connection(object):
         Number of the connection on the side (0 to 2)
     """
 
+    __slots__ = ("side", "number")
+
     def __init__(self, side: int, number: int) -> None:
         self.side = side
         self.number = number
 
-    def rotate_once(self) -> None:
-        """
-        Rotate 90 degrees to the right
-        """
-        self.side += 1
-        self.side %= 4
-
     def to_number(self) -> int:
         """
         Returns a number from 0 to 11 (beginning with left side at the bottom)
@@ -50,35 +48,43 @@ class Feature(object):
     type : int
         Type of the feature
     connections : Sequence[Connection]
-        Connections (open "ports") to other features
+        Connections (open "ports") to other features, shared with the tile type (must not be modified)
+    mask : int
+        12-bit mask of the connections (bit `n` is the connection with number `n`)
     meeple : Player
         Player that has a meeple on this feature (possibly None)
-    uuid : UUID
-        Effect of wrong debugging, probably could be ommited
     bindings : Sequence[Feature]
         The actual connections to the other features ("from this feature I *can get to* any other feature in this list")
     parent_tile : Tile
         The tile this feature belongs to
-    scored : bool
-        Whether it has been counted at the end (while counting open features)
+    region : Region
+        The region (set of bound features) this feature belongs to, None until the tile is placed
     """
 
-    def __init__(self, _type: int, connections: Sequence[Connection]) -> None:
+    __slots__ = (
+        "type",
+        "connections",
+        "mask",
+        "meeple",
+        "bindings",
+        "parent_tile",
+        "region",
+    )
+
+    def __init__(
+        self, _type: int, connections: Sequence[Connection], mask: int = None
+    ) -> None:
         self.type = _type
         self.connections = connections
+        if mask is None:
+            mask = 0
+            for conn in connections:
+                mask |= 1 << conn.to_number()
+        self.mask = mask
         self.meeple: Player = None
-        self.uuid = uuid.uuid4()
         self.bindings = []
         self.parent_tile = None
-        self.scored = False
-
-    def rotate(self, times: int) -> None:
-        """
-        Rotate feature by 90 degrees clockwise `times` times
-        """
-        for i in range(times % 4):
-            for connection in self.connections:
-                connection.rotate_once()
+        self.region: Region = None
 
     def bind(self, feature: "Feature") -> None:
         """
@@ -86,9 +92,15 @@ class Feature(object):
         """
         if feature == self:
             return
-        print(
-            f"Binding {self} at {self.parent_tile.coords} to {feature} at {feature.parent_tile.coords}"
-        )
+        if _trace.isEnabledFor(TRACE):
+            _trace.log(
+                TRACE,
+                "binding %s at %s to %s at %s",
+                self,
+                self.parent_tile.coords,
+                feature,
+                feature.parent_tile.coords,
+            )
         self.bindings.append(feature)
 
     def __repr__(self):
@@ -1,13 +1,80 @@
 from typing import Sequence
 from logic.tile import Tile
-from logic.utils import Coords, parse_connection_number, invert_side, get_side_conn_list
+from logic.tileset import load_tileset
+from logic.utils import (
+    Coords,
+    invert_side,
+    get_side_signature,
+)
 from logic.player import Player
-from logic.const import PLAYER_COLORS, FEATURE_TYPES
-from logic.feature import Feature, Connection
-from copy import copy, deepcopy
+from logic.const import PLAYER_COLORS
+from logic.feature import Feature
+from copy import copy
 import random
 from logic.scoring import Scorer
-import traceback
+from logic.regions import Region, RegionSet
+from logic.board import Board, SIDE_OFFSETS
+from logic.trace import get_tracer, TRACE
+from logic.journal import Journal
+from logic import seeding
+from logic.seeding import make_rng, new_seed
+from collections import Counter, namedtuple
+
+_trace = get_tracer("logic.game")
+
+_NOTHING_REQUIRED = (None, None, None, None)
+_MASK_ROTATIONS = tuple(
+    tuple(rotation for rotation in range(4) if mask >> rotation & 1)
+    for mask in range(16)
+)
+"""Rotations in every 4-bit mask of rotations"""
+
+Move = namedtuple("Move", ["type_id", "rotation", "coords", "meeple"])
+Move.__doc__ = """
+A whole move: tile type, its rotation (relative to the type), coords (x, y) and index of the feature with a meeple (-1 for none)
+"""
+
+ReplayState = namedtuple(
+    "ReplayState",
+    [
+        "starting_tile",
+        "tiles",
+        "players",
+        "history",
+        "pending",
+        "current_rotation",
+        "end_scored",
+        "tile_types",
+        "tileset_hash",
+        "seed",
+    ],
+)
+ReplayState.__doc__ = """
+Flat description of a game that can be rebuilt by replaying the moves
+
+Attributes
+----------
+starting_tile : tuple[TileType, int]
+    Type and rotation of the starting tile
+tiles : list[TileType]
+    Types of the tiles in the tileset as it was at the start (the last one is drawn first)
+players : list[tuple[str, tuple]]
+    Names and colors of the players in the order of turns
+history : list[Move]
+    Moves made so far
+pending : tuple[tuple[int, int], int]
+    Coords and rotation of a tile placed without a meeple yet (None in the tile placing phase)
+current_rotation : int
+    Rotation of the current tile (while it is being placed)
+end_scored : bool
+    Whether the open features have been scored at the end
+tile_types : list[TileType]
+    Table of the tile types of the tileset
+tileset_hash : str
+    Hash of the tileset the game was created from (None if unknown)
+seed : int
+    Seed of the game
+"""
 
 
 class CarcassonneGame:
@@ -23,8 +90,8 @@ class CarcassonneGame:
         List of players in the game
     turn : int
         Index of the player whose turn is now
-    board : dict
-        Dictionary mapping Coords to tiles, represents the actual board (only tiles that have been placed)
+    board : Board
+        Tiles that have been placed, by their Coords
     lastTile : Tile
         The last (most recent) tile placed in the game
     phase : int
@@ -32,26 +99,72 @@ class CarcassonneGame:
         1 - placing a meeple (or decision not to place any)
     scorer : Scorer
         Object used for routing on the features and dealing with score
+    regions : RegionSet
+        Regions (sets of bound features) on the board, kept up to date while placing tiles
     tlesChanged : set
         A set of tiles that have changed in effect of placing the most recent meeple
+    frontier : dict
+        Dictionary mapping empty Coords next to placed tiles to tuples of the required side signatures (None for sides without a neighbor)
+    discarded : list[Tile]
+        Tiles that could not be placed anywhere when drawn
+    tile_types : list[TileType]
+        Shared table of the tile types in the tileset (set when created from a file)
+    tileset_hash : str
+        SHA-256 of the tileset file the game was created from (None if not created from a file)
+    seed : int
+        Seed of the game, the tileset and the players are shuffled by its streams (see `logic.seeding`)
+    startingTile : Tile
+        The tile placed at (0, 0) at the start
+    journal : Journal
+        Undo journal of the changes made by the moves (see `snapshot`, `rollback` and `undo`)
+    history : list[Move]
+        Moves made so far
+    endScored : bool
+        Whether the open features have been scored at the end (`handleEnd`)
+    drawn : list[Tile]
+        Tiles taken from the tileset so far (placed or discarded) in the order they were drawn
+    closedRegions : list[Region]
+        Roads, cities and cloisters closed by placing the most recent tile (scored after placing a meeple)
     """
 
     def __init__(
-        self, starting_tile: Tile, tileset: Sequence[Tile], players: Sequence[Player]
+        self,
+        starting_tile: Tile,
+        tileset: Sequence[Tile],
+        players: Sequence[Player],
+        seed: int = None,
+        shuffle: bool = True,
     ) -> None:
+        if seed is None:
+            seed = new_seed()
+        self.seed = seed
         self.tileset = copy(tileset)
-        random.shuffle(self.tileset)
         self.players = copy(players)
-        random.shuffle(self.players)
+        if shuffle:
+            make_rng(seed, seeding.TILES).shuffle(self.tileset)
+            make_rng(seed, seeding.SEATS).shuffle(self.players)
         self.turn = 0
-        self.board = dict()
+        self.board = Board()
         starting_tile.coords = Coords(0, 0)
         starting_tile.ensureCorrect()
-        self.board[Coords(0, 0)] = starting_tile
+        self.startingTile = starting_tile
         self.lastTile = None
         self.phase = 0
+        self.journal = Journal()
+        self.history = []
+        self.drawn = []
         self.scorer = Scorer(self)
+        self.regions = RegionSet(self.journal)
+        self.frontier = dict()
+        self._add_to_board(starting_tile)
+        self.discarded = []
+        self._discard_unplaceable()
         self.tilesChanged = set()
+        self.closedRegions = []
+        self.tile_types = []
+        self.tileset_hash = None
+        self.endScored = False
+        self.journal.clear()
 
     def get_current_player_name(self) -> str:
         return self.players[self.turn].name
@@ -60,7 +173,7 @@ class CarcassonneGame:
         return self.players[self.turn].color
 
     def get_current_tile(self) -> Tile:
-        print(f"Current tile: {self.tileset[-1]}")
+        _trace.log(TRACE, "current tile: %s", self.tileset[-1])
         return self.tileset[-1]
 
     def is_finished(self) -> bool:
@@ -74,7 +187,152 @@ class CarcassonneGame:
 
         return [player for player in self.players if player.score == max_score]
 
-    def place_tile(self, coords: Coords | tuple[int, int] | list[int, int]) -> None:
+    def _update_frontier(self, tile: Tile) -> None:
+        """Update the frontier after placing the given tile"""
+        coords = tile.coords
+        if coords in self.frontier:
+            self.journal.record(
+                self.frontier.__setitem__, coords, self.frontier.pop(coords)
+            )
+        for side, neighbor in enumerate(self.board.neighbors(coords.x, coords.y)):
+            if neighbor is not None:
+                continue
+            dx, dy = SIDE_OFFSETS[side]
+            adjacent = Coords(coords.x + dx, coords.y + dy)
+            required = self.frontier.get(adjacent)
+            if required is None:
+                required = _NOTHING_REQUIRED
+                self.journal.record(self.frontier.pop, adjacent)
+            else:
+                self.journal.record(self.frontier.__setitem__, adjacent, required)
+            opposite = invert_side(side)
+            required = list(required)
+            required[opposite] = tuple(reversed(get_side_signature(tile, side)))
+            self.frontier[adjacent] = tuple(required)
+
+    def _fits(self, tile: Tile, coords: Coords, rotation: int) -> bool:
+        """Check whether the tile rotated `rotation` times fits in the frontier position `coords`"""
+        fitting = tile.type.get_fitting_mask(self.frontier[coords])
+        return fitting >> (tile.rotation + rotation) % 4 & 1 == 1
+
+    def legal_placements(self, tile: Tile = None) -> list[tuple[Coords, int]]:
+        """
+        Get all positions the tile can be placed on
+
+        Parameters
+        ----------
+        tile : Tile
+            Tile to place (the current tile by default)
+
+        Returns
+        -------
+        list[tuple[Coords, int]]
+            Pairs of coords and number of 90 degrees clockwise rotations needed to place the tile there
+        """
+        if tile is None:
+            tile = self.tileset[-1]
+
+        get_fitting_mask = tile.type.get_fitting_mask
+        current = tile.rotation
+
+        output = []
+        for coords, required in self.frontier.items():
+            fitting = get_fitting_mask(required)
+            if fitting:
+                # relative to the current rotation of the tile
+                fitting = (fitting >> current | fitting << 4 - current) & 0xF
+                for rotation in _MASK_ROTATIONS[fitting]:
+                    output.append((coords, rotation))
+
+        return output
+
+    def can_place(self, tile: Tile = None) -> bool:
+        """Check whether the tile (the current tile by default) can be placed anywhere (stops at the first fit)"""
+        if tile is None:
+            tile = self.tileset[-1]
+        get_fitting_mask = tile.type.get_fitting_mask
+        for required in self.frontier.values():
+            if get_fitting_mask(required):
+                return True
+        return False
+
+    def _discard_unplaceable(self) -> None:
+        """Discard tiles from the top of the tileset until one of them can be placed"""
+        while len(self.tileset) > 0 and not self.can_place():
+            tile = self._draw()
+            self.discarded.append(tile)
+            self.journal.record(self.discarded.pop)
+
+    def _draw(self) -> Tile:
+        """Take the current tile from the tileset"""
+        tile = self.tileset.pop()
+        self.drawn.append(tile)
+        self.journal.record(self._undraw)
+        return tile
+
+    def _undraw(self) -> None:
+        """Put the most recently drawn tile back (reverts `_draw`)"""
+        self.tileset.append(self.drawn.pop())
+
+    def _add_to_board(self, tile: Tile) -> list[Region]:
+        """
+        Put a tile (with its coords already set) on the board: create its regions, bind them to the neighbors and update the frontier
+
+        Returns
+        -------
+        list[Region]
+            Roads, cities and cloisters closed by the tile
+        """
+        journal = self.journal
+        coords = tile.coords
+        adjacent_tiles = self.board.neighbors(coords.x, coords.y)
+        closed = self.regions.add_tile(
+            tile, self.board.count_around(coords.x, coords.y) + 1
+        )
+
+        for side in range(4):
+            adjacent_tile = adjacent_tiles[side]
+            if adjacent_tile is not None:
+                # connection x of a side touches connection 2 - x of the opposite side
+                mine = tile.type.rotations[tile.rotation].feature_by_connection
+                theirs = adjacent_tile.type.rotations[
+                    adjacent_tile.rotation
+                ].feature_by_connection
+                opposite = invert_side(side)
+                my_features = [tile.features[mine[side * 3 + x]] for x in range(3)]
+                neighbor_features = [
+                    adjacent_tile.features[theirs[opposite * 3 + 2 - x]]
+                    for x in range(3)
+                ]
+
+                if _trace.isEnabledFor(TRACE):
+                    _trace.log(
+                        TRACE,
+                        "side %d: %s -> %s",
+                        side,
+                        my_features,
+                        neighbor_features,
+                        extra={"data": {"coords": coords.to_tuple(), "side": side}},
+                    )
+
+                for i in range(3):
+                    my_features[i].bind(neighbor_features[i])
+                    neighbor_features[i].bind(my_features[i])
+                    journal.record(my_features[i].bindings.pop)
+                    journal.record(neighbor_features[i].bindings.pop)
+                    region = self.regions.bind(my_features[i], neighbor_features[i])
+                    if region.is_closed():
+                        closed.append(region)
+
+        self.board[coords] = tile
+        journal.record(self.board.pop, coords)
+        self._update_frontier(tile)
+
+        return closed
+
+    def place_tile(
+        self, coords: Coords | tuple[int, int] | list[int, int], rotation: int = 0
+    ) -> None:
         """
         Place a tile
 
@@ -82,6 +340,8 @@ class CarcassonneGame:
         ----------
         coords : Coords | tuple[int, int] | list[int, int]
             Coords to place the tile on
+        rotation : int
+            Number of 90 degrees clockwise rotations to apply to the tile before placing it
         """
         if self.phase != 0:
             raise Exception("Can't place tile while placing a meeple")
@@ -92,71 +352,29 @@ class CarcassonneGame:
         if isinstance(coords, tuple) or isinstance(coords, list):
             coords = Coords(coords[0], coords[1])
 
-        if coords in self.board.keys():
+        if coords in self.board:
             raise ValueError("Tile already there")
 
-        tile = self.get_current_tile()
-        sides = range(4)
-
-        adjacent_tiles = coords.get_adjacent_coords()
-
-        anyAdjacent = False
-        for side in sides:
-            if adjacent_tiles[side] in self.board.keys():
-                anyAdjacent = True
-                adjacent_tile = self.board[adjacent_tiles[side]]
-                my_side = get_side_conn_list(tile, side)
-                neighbor_side = list(
-                    reversed(get_side_conn_list(adjacent_tile, invert_side(side)))
-                )
-                for conn in range(3):
-                    if my_side[conn] == neighbor_side[conn] or set(
-                        [my_side[conn], neighbor_side[conn]]
-                    ) == set([1, 2]):
-                        continue
-                    raise Exception("Not matching adjacent tile")
-
-        if not anyAdjacent:
+        if coords not in self.frontier:
             raise Exception("No adjacent tile")
 
-        tile.coords = coords
+        tile = self.get_current_tile()
 
-        for side in sides:
-            if adjacent_tiles[side] in self.board.keys():
-                adjacent_tile = self.board[adjacent_tiles[side]]
-                my_features = [
-                    tile.get_feature_by_connection(Connection(side, x))
-                    for x in range(3)
-                ]
-                neighbor_features = list(
-                    reversed(
-                        [
-                            adjacent_tile.get_feature_by_connection(
-                                Connection(invert_side(side), x)
-                            )
-                            for x in range(3)
-                        ]
-                    )
-                )
+        if not self._fits(tile, coords, rotation):
+            raise Exception("Not matching adjacent tile")
 
-                tile.ensureCorrect()
-                adjacent_tile.ensureCorrect()
+        journal = self.journal
+        journal.begin()
 
-                print(f"my tile: {my_features}")
-                print(f"adjacent tile: {neighbor_features}")
+        tile.rotate(rotation)
+        journal.record(tile.rotate, -rotation)
+        journal.set(tile, "coords", coords)
+        journal.set(self, "closedRegions", self._add_to_board(tile))
+        self._draw()
 
-                for i in range(3):
-                    print(f"my feature: {my_features[i]}")
-                    print(f"neighbor feature: {neighbor_features[i]}")
-                    my_features[i].bind(neighbor_features[i])
-                    neighbor_features[i].bind(my_features[i])
-
-        self.board[coords] = tile
-        self.tileset.pop()
+        journal.set(self, "lastTile", tile)
 
-        self.lastTile = tile
-
-        self.phase = 1
+        journal.set(self, "phase", 1)
 
     def placeMeeple(self, feature_index: int) -> None:
         """
@@ -167,11 +385,14 @@ class CarcassonneGame:
         feature_index : int
             Index of the feature on the tile to place the meeple on
         """
-        self.tilesChanged = set()
-
         if self.phase != 1:
             raise Exception("Can't place meeple while placing a tile")
 
+        journal = self.journal
+        journal.begin()
+        mark = journal.mark()
+        journal.set(self, "tilesChanged", set())
+
         try:
             if feature_index != -1:
                 feature = self.lastTile.features[feature_index]
@@ -179,65 +400,198 @@ class CarcassonneGame:
                     raise Exception("Feature already has a meeple")
 
                 self.lastTile.placeMeeple(feature_index, self.players[self.turn])
-                # closing features
-            for feature in self.lastTile.features:
-                tiles = self.scorer.score_closed_feature(feature)
-                self.tilesChanged.update(tiles)
+                journal.record(self._remove_meeple, feature)
+
+            # only regions closed by the last tile can score now, each of them is in closedRegions once
+            for region in self.closedRegions:
+                self.tilesChanged.update(self.scorer.score_closed_region(region))
+            self.history.append(
+                Move(
+                    self.lastTile.type.id,
+                    self.lastTile.rotation,
+                    self.lastTile.coords.to_tuple(),
+                    feature_index,
+                )
+            )
+            journal.record(self.history.pop)
             self.next_turn()
-            self.phase = 0
+            journal.set(self, "phase", 0)
         except Exception as e:
-            traceback.print_exc()
-            raise Exception("Can't place meeple")
+            _trace.debug("can't place meeple on %d", feature_index, exc_info=True)
+            journal.rollback(mark)
+            raise Exception("Can't place meeple") from e
+
+    def _remove_meeple(self, feature: Feature) -> None:
+        """Take a meeple back from the feature (reverts placing it)"""
+        if feature.region is not None:
+            feature.region.remove_meeple(feature)
+        feature.meeple.meeplesLeft += 1
+        feature.meeple = None
+
+    def get_meeple_options(self) -> list[int]:
+        """
+        Get the indices of the features of the last tile a meeple can be placed on (-1 meaning no meeple is always there)
+        """
+        if self.phase != 1:
+            raise Exception("Can't place meeple while placing a tile")
+
+        options = [-1]
+        if self.players[self.turn].meeplesLeft == 0:
+            return options
+
+        for i, feature in enumerate(self.lastTile.features):
+            if not self.scorer.check_any_meeples(feature):
+                options.append(i)
+
+        return options
+
+    def step(
+        self, placement: tuple[Coords | tuple[int, int], int], feature_index: int = -1
+    ) -> None:
+        """
+        Make a whole move: place the current tile and then a meeple
+
+        Parameters
+        ----------
+        placement : tuple[Coords | tuple[int, int], int]
+            Coords and rotation of the tile (as returned by `legal_placements`)
+        feature_index : int
+            Index of the feature on the tile to place the meeple on (-1 for no meeple)
+        """
+        coords, rotation = placement
+        self.place_tile(coords, rotation)
+        self.placeMeeple(feature_index)
 
     def next_turn(self) -> None:
         """
         Go to the next turn
         """
-        self.turn += 1
-        self.turn %= len(self.players)
+        self.journal.set(self, "turn", (self.turn + 1) % len(self.players))
+        self._discard_unplaceable()
 
-    def handleEnd(self) -> None:
+    def get_rng(self, stream: str, *keys) -> random.Random:
+        """Get a new random number generator of a stream of the game's seed (e.g. `get_rng(seeding.BOTS, seat)`)"""
+        return make_rng(self.seed, stream, *keys)
+
+    def shuffle_remaining(self, rng: random.Random) -> None:
+        """Shuffle the tiles that have not been drawn yet, except the current one (reverted by `rollback`)"""
+        self.journal.record(self.tileset.__setitem__, slice(None), list(self.tileset))
+        remaining = self.tileset[:-1]
+        rng.shuffle(remaining)
+        self.tileset[:-1] = remaining
+
+    def snapshot(self) -> int:
+        """
+        Get a snapshot of the current state (cheap: just a position in the undo journal)
+
+        The state can be restored with `rollback` as long as no earlier snapshot has been rolled back to in the meantime
+        """
+        return self.journal.mark()
+
+    def rollback(self, snapshot: int) -> None:
+        """Restore the state of the game from a snapshot taken with `snapshot`"""
+        self.journal.rollback(snapshot)
+
+    def undo(self) -> None:
+        """Revert the most recent tile or meeple placement (or scoring at the end)"""
+        self.journal.undo()
+
+    def get_replay_state(self) -> "ReplayState":
+        """Get a flat, picklable description of the game from which it can be rebuilt by replaying the moves"""
+        pending = None
+        if self.phase == 1:
+            pending = (self.lastTile.coords.to_tuple(), self.lastTile.rotation)
+        current_rotation = 0
+        if self.phase == 0 and len(self.tileset) > 0:
+            current_rotation = self.tileset[-1].rotation
+
+        return ReplayState(
+            (self.startingTile.type, self.startingTile.rotation),
+            [tile.type for tile in self.tileset + list(reversed(self.drawn))],
+            [(player.name, player.color) for player in self.players],
+            list(self.history),
+            pending,
+            current_rotation,
+            self.endScored,
+            self.tile_types,
+            self.tileset_hash,
+            self.seed,
+        )
+
+    @classmethod
+    def from_replay_state(cls, state: "ReplayState") -> "CarcassonneGame":
+        """Rebuild a game from `get_replay_state` by replaying its moves on new tiles"""
+        starting_type, starting_rotation = state.starting_tile
+        game = cls(
+            Tile(None, starting_type, starting_rotation),
+            [Tile(None, tile_type) for tile_type in state.tiles],
+            [Player(name, color) for name, color in state.players],
+            state.seed,
+            shuffle=False,
+        )
+        game.tile_types = state.tile_types
+        game.tileset_hash = state.tileset_hash
+
+        game.startingTile.game = game
+        for tile in game.tileset:
+            tile.game = game
+
+        for move in state.history:
+            game.replay_move(move)
+
+        if state.pending is not None:
+            coords, rotation = state.pending
+            game.place_tile(coords, (rotation - game.tileset[-1].rotation) % 4)
+        elif len(game.tileset) > 0:
+            game.tileset[-1].rotate(state.current_rotation)
+
+        if state.end_scored:
+            game.handleEnd()
+
+        game.journal.clear()
+        return game
+
+    def clone(self) -> "CarcassonneGame":
+        """
+        Make an independent copy of the game
+
+        The copy shares only the immutable tile types; it is rebuilt by replaying the moves
+        on new tiles instead of copying the whole object graph
+        """
+        return CarcassonneGame.from_replay_state(self.get_replay_state())
+
+    def replay_move(self, move: Move) -> None:
+        """Make a move from the history of a game"""
+        tile = self.tileset[-1]
+        if tile.type.id != move.type_id:
+            raise ValueError("The move doesn't match the current tile")
+        self.step(
+            (Coords(*move.coords), (move.rotation - tile.rotation) % 4), move.meeple
+        )
+
+    def handleEnd(self) -> dict[Player, Counter]:
         """
         Score open features at the end of the game
+
+        Returns
+        -------
+        dict[Player, Counter]
+            Points every player got at the end per feature type
         """
         if not self.is_finished():
             raise Exception(
                 "Can't handle the end of game while it is still in progress"
             )
 
-        for tile in self.board.values():
-            for feature in tile.features:
-                self.scorer.score_open_feature(feature)
+        self.journal.begin()
+        self.journal.set(self, "endScored", True)
 
-    @staticmethod
-    def parseFeatureText(feature: str) -> Feature:
-        """
-        Helper function to parse a single feature from a string
-
-        Parameters
-        ----------
-        feature : str
-            String of the feature to parse
-        """
-
-        def parseConnections(t: str):
-            return [parse_connection_number(int(x)) for x in t.split(",")]
-
-        if feature[0] == "M":
-            return Feature(FEATURE_TYPES.CLOISTER, [])
-        elif feature[0] == "F":
-            return Feature(FEATURE_TYPES.FARM, parseConnections(feature[1:]))
-        elif feature[0] == "C":
-            return Feature(FEATURE_TYPES.CITY, parseConnections(feature[1:]))
-        elif feature[0] == "P":
-            return Feature(FEATURE_TYPES.PENNANT_CITY, parseConnections(feature[1:]))
-        elif feature[0] == "R":
-            return Feature(FEATURE_TYPES.ROAD, parseConnections(feature[1:]))
-        else:
-            raise Exception("Unknown feature type")
+        return self.scorer.score_end()
 
     @classmethod
-    def from_file_and_names(cls, filename: str, playerNames: Sequence[str]):
+    def from_file_and_names(
+        cls, filename: str, playerNames: Sequence[str], seed: int = None
+    ):
         """
         Creates a new instance of CarcassonneGame from a given tileset file and names of the players
 
@@ -247,53 +601,33 @@ class CarcassonneGame:
             Filename of the file to read the tileset from
         playerNames: Sequence[str]
             Names of the players
+        seed : int
+            Seed of the game (a fresh random one by default)
         """
+        compiled = load_tileset(filename)
+        if compiled.starting is None:
+            raise Exception("The tileset has no starting tile")
+
         tileset = []
         startingTile = None
-
-        f = open(filename, "r")
-        s_tile = False
-        for line in f.readlines():
-            line = line.strip()
-            if len(line) == 0:
-                continue
-
-            s_tile = False
-
-            arr = line.split(" ")
-            if arr[0] == "S":
-                s_tile = True
-                arr = arr[1:]
-
-            n = int(arr[0])
-
-            features = []
-            for feature in arr[1:]:
-                features.append(CarcassonneGame.parseFeatureText(feature))
-
-            tile = Tile(None, features)
-
-            for feature in tile.features:
-                feature.parent_tile = tile
-
-            if s_tile:
-                startingTile = copy(tile)
+        for tile_type, n in zip(compiled.types, compiled.counts):
+            if tile_type.id == compiled.starting:
+                startingTile = Tile(None, tile_type)
                 n -= 1
 
             for i in range(n):
-                tileset.append(deepcopy(tile))
-
-            tileset[-1].ensureCorrect()
-
-        f.close()
+                tileset.append(Tile(None, tile_type))
 
         players = []
         colors = copy(PLAYER_COLORS)
         for name in playerNames:
             players.append(Player(name, colors.pop()))
 
-        obj = cls(startingTile, tileset, players)
+        obj = cls(startingTile, tileset, players, seed)
+        obj.tile_types = list(compiled.types)
+        obj.tileset_hash = compiled.hash
 
+        startingTile.game = obj
         for tile in tileset:
             tile.game = obj
 
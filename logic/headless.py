@@ -0,0 +1,130 @@
+"""
+Headless driver of the game: plays whole games without pygame, any view imports or a display
+
+Example::
+
+    from logic.headless import run_game, RandomPolicy
+
+    game = run_game(42, [RandomPolicy(), RandomPolicy()])
+    print([(player.name, player.score) for player in game.players])
+"""
+from abc import abstractmethod
+from logic.game import CarcassonneGame
+from logic.seeding import BOTS
+from logic.utils import Coords
+from typing import Sequence
+import os
+import random
+
+DEFAULT_TILESET = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+    "assets",
+    "default_tileset",
+)
+
+
+class Policy(object):
+    """
+    Interface of a player policy (decides the moves of one seat in a headless game)
+
+    Attributes
+    ----------
+    rng : random.Random
+        Random number generator of the policy, None unless given; while `run_game` plays,
+        it is the stream of the seat in that game (see `logic.seeding.BOTS`)
+    """
+
+    rng: random.Random = None
+
+    def get_rng(self) -> random.Random:
+        """Get the random number generator (an unseeded one if no game has seeded it)"""
+        if self.rng is None:
+            self.rng = random.Random()
+        return self.rng
+
+    @abstractmethod
+    def choose_placement(
+        self, game: CarcassonneGame, placements: Sequence[tuple[Coords, int]]
+    ) -> tuple[Coords, int]:
+        """Choose one of the legal placements (coords, rotation) of the current tile"""
+        pass
+
+    @abstractmethod
+    def choose_meeple(self, game: CarcassonneGame, options: Sequence[int]) -> int:
+        """Choose a feature of the placed tile to put a meeple on (one of `options`, -1 for no meeple)"""
+        pass
+
+
+class RandomPolicy(Policy):
+    """Policy picking uniformly random moves"""
+
+    def __init__(self, rng: random.Random = None) -> None:
+        self.rng = rng
+
+    def choose_placement(
+        self, game: CarcassonneGame, placements: Sequence[tuple[Coords, int]]
+    ) -> tuple[Coords, int]:
+        return self.get_rng().choice(placements)
+
+    def choose_meeple(self, game: CarcassonneGame, options: Sequence[int]) -> int:
+        return self.get_rng().choice(options)
+
+
+def play_turn(game: CarcassonneGame, policy: Policy) -> None:
+    """Let the policy place the current tile and a meeple"""
+    placement = policy.choose_placement(game, game.legal_placements())
+    game.place_tile(*placement)
+    game.placeMeeple(policy.choose_meeple(game, game.get_meeple_options()))
+
+
+def run_game(
+    seed: int,
+    policies: Sequence[Policy],
+    tileset: str = DEFAULT_TILESET,
+    names: Sequence[str] = None,
+) -> CarcassonneGame:
+    """
+    Play a whole game and score it
+
+    Parameters
+    ----------
+    seed : int
+        Seed of the game (see `logic.seeding`)
+    policies : Sequence[Policy]
+        Policies of the players (one for each player), those without a random number generator
+        get the stream of their seat (the index in `policies`) for this game only
+    tileset : str
+        Filename of the tileset
+    names : Sequence[str]
+        Names of the players ("Player 1", "Player 2", ... by default)
+
+    Returns
+    -------
+    CarcassonneGame
+        The finished game
+    """
+    if names is None:
+        names = [f"Player {i + 1}" for i in range(len(policies))]
+    if len(names) != len(policies):
+        raise ValueError("There must be exactly one policy for each player")
+    if len(set(names)) != len(names):
+        raise ValueError("Names of the players must be unique")
+
+    game = CarcassonneGame.from_file_and_names(tileset, names, seed)
+    # the streams are for this game only, the policies may play other games later
+    unseeded = [policy for policy in policies if policy.rng is None]
+    for seat, policy in enumerate(policies):
+        if policy.rng is None:
+            policy.rng = game.get_rng(BOTS, seat)
+    # players get shuffled, so remember whose policy is whose before that
+    seats = dict(zip(names, policies))
+
+    try:
+        while not game.is_finished():
+            play_turn(game, seats[game.get_current_player_name()])
+    finally:
+        for policy in unseeded:
+            policy.rng = None
+
+    game.handleEnd()
+    return game
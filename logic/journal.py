@@ -0,0 +1,63 @@
+from typing import Any, Callable
+
+
+class Journal(object):
+    """
+    Undo journal: every change of the game state made by a move is recorded together with a way to revert it
+
+    Entries are reverted in the opposite order they were recorded in,
+    so every undo function sees exactly the state right after its change
+
+    Attributes
+    ----------
+    entries : list[tuple[Callable, tuple]]
+        Undo functions with their arguments
+    marks : list[int]
+        Lengths of `entries` at the beginnings of the moves (see `begin` and `undo`)
+    """
+
+    __slots__ = ("entries", "marks")
+
+    def __init__(self) -> None:
+        self.entries = []
+        self.marks = []
+
+    def record(self, undo: Callable, *args) -> None:
+        """Record a function (called with `args`) that reverts a change"""
+        self.entries.append((undo, args))
+
+    def set(self, obj: Any, name: str, value: Any) -> None:
+        """Set an attribute and record its previous value"""
+        self.entries.append((setattr, (obj, name, getattr(obj, name))))
+        setattr(obj, name, value)
+
+    def mark(self) -> int:
+        """Get a position in the journal to roll back to later"""
+        return len(self.entries)
+
+    def rollback(self, mark: int) -> None:
+        """Revert all the changes recorded after the given mark"""
+        entries = self.entries
+        while len(entries) > mark:
+            undo, args = entries.pop()
+            undo(*args)
+        while len(self.marks) > 0 and self.marks[-1] >= mark:
+            self.marks.pop()
+
+    def begin(self) -> None:
+        """Mark the beginning of a move"""
+        self.marks.append(len(self.entries))
+
+    def undo(self) -> None:
+        """Revert the most recent move"""
+        if len(self.marks) == 0:
+            raise ValueError("Nothing to undo")
+        self.rollback(self.marks.pop())
+
+    def clear(self) -> None:
+        """Forget everything (the current state can't be reverted any more)"""
+        self.entries = []
+        self.marks = []
+
+    def __len__(self) -> int:
+        return len(self.entries)
@@ -0,0 +1,261 @@
+"""
+Monte Carlo Tree Search bot
+
+The search is an information set MCTS: every iteration shuffles the tiles that have not been drawn yet
+(the bot doesn't know their order), walks the tree with UCB1 (counting how often each move was available),
+adds one node and plays the game to the end with random moves.
+Iterations are played on the real game and reverted with its undo journal.
+
+With more than one worker, independent trees are searched in worker processes (root parallelization)
+and their visit counts are summed up.
+"""
+from concurrent.futures import ProcessPoolExecutor
+from logic.game import CarcassonneGame, ReplayState
+from logic.headless import Policy
+from logic.utils import Coords
+from typing import Sequence
+import math
+import random
+import time
+
+Action = tuple[int, int, int, int]
+"""A whole move: x, y, rotation (relative to the tile type) and index of the feature with a meeple (-1 for none)"""
+
+
+class _Node(object):
+    """Node of the search tree"""
+
+    __slots__ = ("parent", "action", "player", "children", "visits", "wins", "available")
+
+    def __init__(self, parent: "_Node", action: Action, player: int) -> None:
+        self.parent = parent
+        self.action = action
+        self.player = player
+        self.children = dict()
+        self.visits = 0
+        self.wins = 0.0
+        self.available = 1
+
+    def ucb(self, exploration: float) -> float:
+        return self.wins / self.visits + exploration * math.sqrt(
+            math.log(self.available) / self.visits
+        )
+
+
+def get_actions(game: CarcassonneGame) -> list[Action]:
+    """Get all legal moves (placements with all meeple options) for the current tile"""
+    tile = game.tileset[-1]
+    actions = []
+    for coords, rotation in game.legal_placements():
+        snapshot = game.snapshot()
+        game.place_tile(coords, rotation)
+        absolute = tile.rotation
+        for meeple in game.get_meeple_options():
+            actions.append((coords.x, coords.y, absolute, meeple))
+        game.rollback(snapshot)
+    return actions
+
+
+def apply_action(game: CarcassonneGame, action: Action) -> None:
+    """Make a move returned by `get_actions`"""
+    x, y, rotation, meeple = action
+    tile = game.tileset[-1]
+    game.step((Coords(x, y), (rotation - tile.rotation) % 4), meeple)
+
+
+def get_rewards(game: CarcassonneGame) -> list[float]:
+    """Rewards of the players (in the order of turns) at the end of the game: 1 for a win, split between tied winners"""
+    best = max(player.score for player in game.players)
+    winners = [player.score == best for player in game.players]
+    return [int(won) / sum(winners) for won in winners]
+
+
+def rollout(game: CarcassonneGame, rng: random.Random) -> None:
+    """Play the game to the end with random moves"""
+    while not game.is_finished():
+        coords, rotation = rng.choice(game.legal_placements())
+        game.place_tile(coords, rotation)
+        game.placeMeeple(rng.choice(game.get_meeple_options()))
+
+
+def search(
+    game: CarcassonneGame,
+    iterations: int = None,
+    time_limit: float = None,
+    exploration: float = 0.7,
+    rng: random.Random = None,
+) -> dict[Action, tuple[int, float]]:
+    """
+    Search the game tree from the current state (the game is left unchanged)
+
+    Parameters
+    ----------
+    game : CarcassonneGame
+        Game in the tile placing phase
+    iterations : int
+        Maximal number of iterations
+    time_limit : float
+        Maximal time of the search in seconds
+    exploration : float
+        Exploration constant of UCB1
+    rng : random.Random
+        Random number generator for the shuffles and the rollouts
+
+    Returns
+    -------
+    dict[Action, tuple[int, float]]
+        Visits and wins of every move tried at the root
+    """
+    if iterations is None and time_limit is None:
+        raise ValueError("Either the number of iterations or a time limit is needed")
+    if game.phase != 0 or game.is_finished():
+        raise Exception("Can only search while placing a tile")
+    if rng is None:
+        rng = random.Random()
+
+    root = _Node(None, None, -1)
+    deadline = None if time_limit is None else time.perf_counter() + time_limit
+    done = 0
+
+    while (iterations is None or done < iterations) and (
+        deadline is None or time.perf_counter() < deadline
+    ):
+        snapshot = game.snapshot()
+        game.shuffle_remaining(rng)
+
+        node = root
+        # selection and expansion
+        while not game.is_finished():
+            actions = get_actions(game)
+            untried = [action for action in actions if action not in node.children]
+            for action in actions:
+                child = node.children.get(action)
+                if child is not None:
+                    child.available += 1
+
+            if len(untried) > 0:
+                action = rng.choice(untried)
+                child = _Node(node, action, game.turn)
+                node.children[action] = child
+                apply_action(game, action)
+                node = child
+                break
+
+            node = max(
+                (node.children[action] for action in actions),
+                key=lambda child: child.ucb(exploration),
+            )
+            apply_action(game, node.action)
+
+        rollout(game, rng)
+        game.handleEnd()
+        rewards = get_rewards(game)
+        game.rollback(snapshot)
+
+        while node is not root:
+            node.visits += 1
+            node.wins += rewards[node.player]
+            node = node.parent
+
+        done += 1
+
+    return {
+        action: (child.visits, child.wins) for action, child in root.children.items()
+    }
+
+
+def _search_worker(
+    state: ReplayState,
+    iterations: int,
+    time_limit: float,
+    exploration: float,
+    seed: int,
+) -> dict[Action, tuple[int, float]]:
+    """Search a copy of the game rebuilt in a worker process"""
+    game = CarcassonneGame.from_replay_state(state)
+    return search(game, iterations, time_limit, exploration, random.Random(seed))
+
+
+class MCTSPolicy(Policy):
+    """
+    Bot choosing moves with Monte Carlo Tree Search
+
+    Attributes
+    ----------
+    iterations : int
+        Iteration budget per move (per worker), None for no limit
+    time_limit : float
+        Time budget per move in seconds, None for no limit
+    workers : int
+        Number of worker processes searching independent trees (1 searches in this process)
+    exploration : float
+        Exploration constant of UCB1
+    rng : random.Random
+        Random number generator of the bot (`run_game` seeds it from the game when None)
+    """
+
+    def __init__(
+        self,
+        iterations: int = None,
+        time_limit: float = 1.0,
+        workers: int = 1,
+        exploration: float = 0.7,
+        rng: random.Random = None,
+    ) -> None:
+        if iterations is None and time_limit is None:
+            raise ValueError("Either the number of iterations or a time limit is needed")
+        self.iterations = iterations
+        self.time_limit = time_limit
+        self.workers = workers
+        self.exploration = exploration
+        self.rng = rng
+        self._executor = None
+        self._meeple = -1
+
+    def search(self, game: CarcassonneGame) -> Action:
+        """Find the best move in the current state"""
+        if self.workers <= 1:
+            stats = search(
+                game, self.iterations, self.time_limit, self.exploration, self.get_rng()
+            )
+        else:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(self.workers)
+            state = game.get_replay_state()
+            futures = [
+                self._executor.submit(
+                    _search_worker,
+                    state,
+                    self.iterations,
+                    self.time_limit,
+                    self.exploration,
+                    self.get_rng().getrandbits(64),
+                )
+                for _ in range(self.workers)
+            ]
+            stats = dict()
+            for future in futures:
+                for action, (visits, wins) in future.result().items():
+                    total_visits, total_wins = stats.get(action, (0, 0.0))
+                    stats[action] = (total_visits + visits, total_wins + wins)
+
+        if len(stats) == 0:
+            raise Exception("No move has been searched")
+        return max(stats, key=lambda action: stats[action])
+
+    def choose_placement(
+        self, game: CarcassonneGame, placements: Sequence[tuple[Coords, int]]
+    ) -> tuple[Coords, int]:
+        x, y, rotation, self._meeple = self.search(game)
+        return (Coords(x, y), (rotation - game.tileset[-1].rotation) % 4)
+
+    def choose_meeple(self, game: CarcassonneGame, options: Sequence[int]) -> int:
+        if self._meeple in options:
+            return self._meeple
+        return -1
+
+    def close(self) -> None:
+        """Stop the worker processes"""
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
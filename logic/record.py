@@ -0,0 +1,154 @@
+"""
+Compact binary records of games and a fast replayer
+
+A record holds everything needed to rebuild a game: the seed, the hash of the tileset,
+the names of the players and the moves. The tileset and the order of the players follow from the seed,
+so every move takes just 4 bytes.
+
+Format (little endian)::
+
+    header  : magic "CGR", version (u8), seed (u64), SHA-256 of the tileset (32 bytes),
+              finished (u8, whether the end has been scored), number of players (u8)
+    players : length (u8) and UTF-8 name of every player in the order of turns
+    moves   : until the end of the data, tile type (u8), x (i8), y (i8),
+              rotation (bits 0-1) and index of the feature with a meeple + 1 (bits 2-7)
+"""
+from collections import namedtuple
+from logic.game import CarcassonneGame, Move
+from logic.seeding import SEATS, make_rng
+import struct
+
+MAGIC = b"CGR"
+VERSION = 1
+
+_HEADER = struct.Struct("<3sBQ32sBB")
+_MOVE = struct.Struct("<BbbB")
+
+GameRecord = namedtuple("GameRecord", ["seed", "tileset_hash", "players", "moves", "finished"])
+GameRecord.__doc__ = """
+Record of a game
+
+Attributes
+----------
+seed : int
+    Seed of the game
+tileset_hash : str
+    SHA-256 (hex) of the tileset
+players : list[str]
+    Names of the players in the order of turns
+moves : list[Move]
+    Moves made in the game
+finished : bool
+    Whether the open features have been scored at the end
+"""
+
+
+def encode_move(move: Move) -> bytes:
+    """Encode a single move in 4 bytes"""
+    x, y = move.coords
+    if not (-128 <= x < 128 and -128 <= y < 128):
+        raise ValueError(f"Coords {move.coords} don't fit in a record")
+    if not (0 <= move.type_id < 256 and -1 <= move.meeple < 63):
+        raise ValueError(f"Move {move} doesn't fit in a record")
+    return _MOVE.pack(move.type_id, x, y, move.rotation | (move.meeple + 1) << 2)
+
+
+def get_record(game: CarcassonneGame) -> GameRecord:
+    """Get the record of a game (the moves made so far)"""
+    if game.tileset_hash is None:
+        raise ValueError("Only games created from a tileset file can be recorded")
+    return GameRecord(
+        game.seed,
+        game.tileset_hash,
+        [player.name for player in game.players],
+        list(game.history),
+        game.endScored,
+    )
+
+
+def encode_record(record: GameRecord) -> bytes:
+    """Encode a record in the binary format"""
+    parts = [
+        _HEADER.pack(
+            MAGIC,
+            VERSION,
+            record.seed,
+            bytes.fromhex(record.tileset_hash),
+            int(record.finished),
+            len(record.players),
+        )
+    ]
+    for name in record.players:
+        encoded = name.encode()
+        if len(encoded) > 255:
+            raise ValueError(f"Name {name} is too long for a record")
+        parts.append(bytes([len(encoded)]))
+        parts.append(encoded)
+    parts.extend(encode_move(move) for move in record.moves)
+    return b"".join(parts)
+
+
+def decode_record(data: bytes) -> GameRecord:
+    """Decode a record from the binary format"""
+    magic, version, seed, digest, finished, n_players = _HEADER.unpack_from(data, 0)
+    if magic != MAGIC or version != VERSION:
+        raise ValueError("Not a game record of a supported version")
+
+    offset = _HEADER.size
+    players = []
+    for _ in range(n_players):
+        length = data[offset]
+        players.append(data[offset + 1 : offset + 1 + length].decode())
+        offset += 1 + length
+
+    if (len(data) - offset) % _MOVE.size != 0:
+        raise ValueError("Truncated game record")
+    moves = [
+        Move(type_id, flags & 3, (x, y), (flags >> 2) - 1)
+        for type_id, x, y, flags in _MOVE.iter_unpack(data[offset:])
+    ]
+
+    return GameRecord(seed, digest.hex(), players, moves, bool(finished))
+
+
+def replay(record: GameRecord, tileset: str, moves: int = None) -> CarcassonneGame:
+    """
+    Rebuild a game from its record by making the recorded moves again (nothing is rendered)
+
+    Parameters
+    ----------
+    record : GameRecord
+        Record of the game
+    tileset : str
+        Filename of the tileset the game was played with (its hash must match the record)
+    moves : int
+        Number of moves to make (all by default), so any state of the game can be rebuilt
+
+    Returns
+    -------
+    CarcassonneGame
+        The game after the moves (with an empty undo journal)
+    """
+    # the players are shuffled by the seed, so find the order they were given in
+    order = list(range(len(record.players)))
+    make_rng(record.seed, SEATS).shuffle(order)
+    names = [None] * len(order)
+    for turn, index in enumerate(order):
+        names[index] = record.players[turn]
+
+    game = CarcassonneGame.from_file_and_names(tileset, names, record.seed)
+    if game.tileset_hash != record.tileset_hash:
+        raise ValueError("The record was made with a different tileset")
+
+    to_replay = record.moves if moves is None else record.moves[:moves]
+    journal = game.journal
+    for move in to_replay:
+        game.replay_move(move)
+        # nothing will be undone, keep the journal from growing
+        journal.clear()
+
+    if record.finished and len(to_replay) == len(record.moves):
+        game.handleEnd()
+        journal.clear()
+
+    return game
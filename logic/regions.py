@@ -0,0 +1,274 @@
+from collections import Counter
+from logic.const import FEATURE_TYPES
+from logic.utils import coords_key
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from logic.feature import Feature
+    from logic.player import Player
+    from logic.tile import Tile
+    from logic.journal import Journal
+
+
+class Region(object):
+    """
+    A set of bound features (a whole city, road, farm or a single cloister)
+
+    Attributes
+    ----------
+    type : int
+        Type of the features in the region (cities with pennants are just cities here)
+    features : list[Feature]
+        All features that belong to the region
+    open_edges : int
+        Number of connections of the features that are not bound to any other feature yet
+    meeples : Counter
+        Number of meeples on the region per player
+    meeple_features : list[Feature]
+        Features of the region with a meeple on them
+    tiles : set[Tile]
+        Tiles the region spans
+    pennants : int
+        Number of cities with a pennant in the region
+    around : int
+        Number of tiles in the 3x3 square centered at a cloister (including its own tile, 0 for other regions)
+    adjacent : set[Region]
+        Cities touching a farm, or farms touching a city (empty for roads and cloisters)
+    """
+
+    __slots__ = (
+        "type",
+        "features",
+        "open_edges",
+        "meeples",
+        "meeple_features",
+        "tiles",
+        "pennants",
+        "around",
+        "adjacent",
+    )
+
+    def __init__(self, feature: "Feature") -> None:
+        self.type = feature.type
+        if self.type == FEATURE_TYPES.PENNANT_CITY:
+            self.type = FEATURE_TYPES.CITY
+        self.features = [feature]
+        self.open_edges = len(feature.connections)
+        self.meeples = Counter()
+        self.meeple_features = []
+        self.tiles = {feature.parent_tile}
+        self.pennants = int(feature.type == FEATURE_TYPES.PENNANT_CITY)
+        self.around = int(feature.type == FEATURE_TYPES.CLOISTER)
+        self.adjacent = set()
+
+        if feature.meeple is not None:
+            self.add_meeple(feature)
+
+    def add_meeple(self, feature: "Feature") -> None:
+        """Count the meeple standing on the given feature of this region"""
+        self.meeples[feature.meeple] += 1
+        self.meeple_features.append(feature)
+
+    def remove_meeple(self, feature: "Feature") -> None:
+        """Stop counting the meeple on the given feature (reverts `add_meeple`)"""
+        self.meeples[feature.meeple] -= 1
+        if self.meeples[feature.meeple] == 0:
+            del self.meeples[feature.meeple]
+        self.meeple_features.remove(feature)
+
+    def clear_meeples(self) -> None:
+        """Forget all meeples (after they have been returned to their owners)"""
+        self.meeples.clear()
+        self.meeple_features = []
+
+    def get_leaders(self) -> list["Player"]:
+        """Get players with the most meeples on the region"""
+        if len(self.meeples) == 0:
+            return []
+        max_count = max(self.meeples.values())
+        return [player for player, count in self.meeples.items() if count == max_count]
+
+    def is_closed(self) -> bool:
+        """Check whether the region is closed (farms are never closed, cloisters are when surrounded by 8 tiles)"""
+        if self.type == FEATURE_TYPES.FARM:
+            return False
+        if self.type == FEATURE_TYPES.CLOISTER:
+            return self.around == 9
+        return self.open_edges == 0
+
+    def __len__(self) -> int:
+        return len(self.features)
+
+    def __repr__(self):
+        return f"Region[{self.type};{len(self.features)} features;{self.open_edges} open]"
+
+
+class RegionSet(object):
+    """
+    Disjoint-set structure over all features on the board, updated when a tile is placed
+
+    Every feature points directly at its region (`Feature.region`),
+    so finding the region is O(1); when two regions are joined
+    the smaller one is relabeled (union by size), which keeps the total cost of all joins at O(n log n)
+
+    Attributes
+    ----------
+    regions : set[Region]
+        All regions currently on the board
+    journal : Journal
+        Journal to record the changes in (so they can be reverted)
+    watchers : dict[int, list[Region]]
+        Cloisters around every position (by `coords_key`), counting the tiles placed there
+    """
+
+    def __init__(self, journal: "Journal") -> None:
+        self.regions = set()
+        self.journal = journal
+        self.watchers = dict()
+
+    def add_tile(self, tile: "Tile", around: int = 1) -> list[Region]:
+        """
+        Create a separate region for every feature of a newly placed tile and count it for the cloisters around
+
+        Parameters
+        ----------
+        tile : Tile
+            Tile being placed (its coords are already set)
+        around : int
+            Number of tiles in the 3x3 square centered at the tile, including the tile itself
+
+        Returns
+        -------
+        list[Region]
+            Cloisters closed by placing the tile (including its own cloister)
+        """
+        journal = self.journal
+        x, y = tile.coords.x, tile.coords.y
+        closed = []
+
+        for region in self.watchers.get(coords_key(x, y), ()):
+            journal.set(region, "around", region.around + 1)
+            if region.around == 9:
+                closed.append(region)
+
+        for feature in tile.features:
+            region = Region(feature)
+            feature.region = region
+            self.regions.add(region)
+            if region.type == FEATURE_TYPES.CLOISTER:
+                region.around = around
+                if around == 9:
+                    closed.append(region)
+                for dx in (-1, 0, 1):
+                    for dy in (-1, 0, 1):
+                        if dx != 0 or dy != 0:
+                            watching = self.watchers.setdefault(
+                                coords_key(x + dx, y + dy), []
+                            )
+                            watching.append(region)
+                            journal.record(watching.pop)
+
+        adjacency = tile.type.rotations[tile.rotation].adjacency
+        for index, farm in enumerate(tile.features):
+            if farm.type != FEATURE_TYPES.FARM:
+                continue
+            for other, city in enumerate(tile.features):
+                if (
+                    adjacency[index] >> other & 1
+                    and city.region.type == FEATURE_TYPES.CITY
+                ):
+                    farm.region.adjacent.add(city.region)
+                    city.region.adjacent.add(farm.region)
+
+        journal.record(self.remove_tile, tile)
+
+        return closed
+
+    def remove_tile(self, tile: "Tile") -> None:
+        """Remove the regions of a tile that is not bound to anything (reverts `add_tile`)"""
+        for feature in tile.features:
+            region = feature.region
+            for other in region.adjacent:
+                other.adjacent.discard(region)
+            self.regions.discard(region)
+            feature.region = None
+
+    def union(self, r1: Region, r2: Region) -> Region:
+        """Join two regions and return the joined one"""
+        if r1 is r2:
+            return r1
+
+        if len(r1.features) < len(r2.features):
+            r1, r2 = r2, r1
+
+        self.journal.record(
+            self._split,
+            r1,
+            r2,
+            len(r1.features),
+            len(r1.meeple_features),
+            [tile for tile in r2.tiles if tile not in r1.tiles],
+            r1.open_edges,
+            r1.pennants,
+            [region for region in r2.adjacent if region not in r1.adjacent],
+        )
+
+        for feature in r2.features:
+            feature.region = r1
+
+        r1.features.extend(r2.features)
+        r1.open_edges += r2.open_edges
+        r1.meeples.update(r2.meeples)
+        r1.meeple_features.extend(r2.meeple_features)
+        r1.tiles.update(r2.tiles)
+        r1.pennants += r2.pennants
+        for other in r2.adjacent:
+            other.adjacent.discard(r2)
+            other.adjacent.add(r1)
+        r1.adjacent.update(r2.adjacent)
+
+        self.regions.discard(r2)
+
+        return r1
+
+    def _split(
+        self,
+        r1: Region,
+        r2: Region,
+        features: int,
+        meeple_features: int,
+        added_tiles: list["Tile"],
+        open_edges: int,
+        pennants: int,
+        added_adjacent: list[Region],
+    ) -> None:
+        """Split a joined region back (reverts `union`, `r2` has not been changed by it)"""
+        for feature in r2.features:
+            feature.region = r2
+
+        del r1.features[features:]
+        del r1.meeple_features[meeple_features:]
+        r1.meeples.subtract(r2.meeples)
+        for player in [player for player, count in r1.meeples.items() if count <= 0]:
+            del r1.meeples[player]
+        r1.tiles.difference_update(added_tiles)
+        r1.open_edges = open_edges
+        r1.pennants = pennants
+        for other in r2.adjacent:
+            other.adjacent.add(r2)
+        for other in added_adjacent:
+            other.adjacent.discard(r1)
+        r1.adjacent.difference_update(added_adjacent)
+
+        self.regions.add(r2)
+
+    def bind(self, f1: "Feature", f2: "Feature") -> Region:
+        """
+        Bind two features through a pair of touching connections (one connection of each feature)
+
+        Both connections stop being open, so the returned (joined) region
+        is closed right after the binding that takes its last open connection
+        """
+        region = self.union(f1.region, f2.region)
+        self.journal.set(region, "open_edges", region.open_edges - 2)
+        return region
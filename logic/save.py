@@ -0,0 +1,230 @@
+"""
+Saving and loading games in progress
+
+A saved game is a flat, versioned binary encoding of the whole state: the players, the placed and discarded tiles
+in the order they were drawn (with their meeples), the order of the remaining tiles, the moves, the phase and the turn.
+Loading puts the placed tiles back on the board in one linear pass, which rebuilds the regions and the frontier;
+the undo journal starts empty.
+
+Format (little endian)::
+
+    header    : magic "CGS", version (u8), seed (u64), SHA-256 of the tileset (32 bytes),
+                phase (u8), turn (u8), end scored (u8), number of players (u8)
+    players   : length (u8) and UTF-8 name, color (3 x u8), score (u32), meeples left (u8)
+    completed : count (u8), then feature type (u8) and number of completed features (u32)
+    start     : type (u16) and rotation (u8) of the starting tile
+    drawn     : count (u16), then type (u16), rotation (bits 0-1, bit 2 for a discarded tile) (u8), x (i16), y (i16),
+                index of the feature with a meeple (i8, -1 for none), owner of the meeple (u8)
+    tileset   : count (u16), then type (u16) of every tile (the last one is drawn next), rotation of the last one (u8)
+    history   : count (u16), then type (u16), x (i16), y (i16), rotation (u8), meeple (i8) of every move
+"""
+from collections import Counter
+from logic.game import CarcassonneGame, Move
+from logic.player import Player
+from logic.tile import Tile
+from logic.tileset import load_tileset
+from logic.utils import Coords
+import struct
+
+MAGIC = b"CGS"
+VERSION = 1
+
+_HEADER = struct.Struct("<3sBQ32sBBBB")
+_PLAYER = struct.Struct("<BBBIB")
+_COMPLETED = struct.Struct("<BI")
+_START = struct.Struct("<HB")
+_COUNT = struct.Struct("<H")
+_DRAWN = struct.Struct("<HBhhbB")
+_TYPE = struct.Struct("<H")
+_ROTATION = struct.Struct("<B")
+_MOVE = struct.Struct("<HhhBb")
+
+_DISCARDED = 4
+
+
+def _pack_name(name: str) -> bytes:
+    encoded = name.encode()
+    if len(encoded) > 255:
+        raise ValueError(f"Name {name} is too long to be saved")
+    return bytes([len(encoded)]) + encoded
+
+
+def save_game(game: CarcassonneGame) -> bytes:
+    """Encode the whole state of a game (it must have been created from a tileset file)"""
+    if game.tileset_hash is None:
+        raise ValueError("Only games created from a tileset file can be saved")
+
+    players = {player: index for index, player in enumerate(game.players)}
+    parts = [
+        _HEADER.pack(
+            MAGIC,
+            VERSION,
+            game.seed,
+            bytes.fromhex(game.tileset_hash),
+            game.phase,
+            game.turn,
+            int(game.endScored),
+            len(game.players),
+        )
+    ]
+
+    for player in game.players:
+        parts.append(_pack_name(player.name))
+        parts.append(_PLAYER.pack(*player.color, player.score, player.meeplesLeft))
+
+    completed = [(_type, count) for _type, count in game.scorer.completed.items() if count]
+    parts.append(bytes([len(completed)]))
+    parts.extend(_COMPLETED.pack(_type, count) for _type, count in completed)
+
+    parts.append(_START.pack(game.startingTile.type.id, game.startingTile.rotation))
+
+    discarded = set(game.discarded)
+    parts.append(_COUNT.pack(len(game.drawn)))
+    for tile in game.drawn:
+        if tile in discarded:
+            parts.append(_DRAWN.pack(tile.type.id, _DISCARDED, 0, 0, -1, 0))
+            continue
+        meeple, owner = -1, 0
+        for index, feature in enumerate(tile.features):
+            if feature.meeple is not None:
+                meeple, owner = index, players[feature.meeple]
+        parts.append(
+            _DRAWN.pack(
+                tile.type.id, tile.rotation, tile.coords.x, tile.coords.y, meeple, owner
+            )
+        )
+
+    parts.append(_COUNT.pack(len(game.tileset)))
+    parts.extend(_TYPE.pack(tile.type.id) for tile in game.tileset)
+    parts.append(
+        _ROTATION.pack(game.tileset[-1].rotation if len(game.tileset) > 0 else 0)
+    )
+
+    parts.append(_COUNT.pack(len(game.history)))
+    parts.extend(
+        _MOVE.pack(move.type_id, *move.coords, move.rotation, move.meeple)
+        for move in game.history
+    )
+
+    return b"".join(parts)
+
+
+def load_game(data: bytes, tileset: str) -> CarcassonneGame:
+    """
+    Rebuild a game saved with `save_game`
+
+    Parameters
+    ----------
+    data : bytes
+        The saved game
+    tileset : str
+        Filename of the tileset the game is played with (its hash must match the saved one)
+    """
+    (
+        magic,
+        version,
+        seed,
+        digest,
+        phase,
+        turn,
+        end_scored,
+        n_players,
+    ) = _HEADER.unpack_from(data, 0)
+    if magic != MAGIC or version != VERSION:
+        raise ValueError("Not a saved game of a supported version")
+    compiled = load_tileset(tileset)
+    if compiled.hash != digest.hex():
+        raise ValueError("The game was saved with a different tileset")
+    types = compiled.types
+    offset = _HEADER.size
+
+    players = []
+    for _ in range(n_players):
+        length = data[offset]
+        name = data[offset + 1 : offset + 1 + length].decode()
+        offset += 1 + length
+        r, g, b, score, meeples_left = _PLAYER.unpack_from(data, offset)
+        offset += _PLAYER.size
+        player = Player(name, (r, g, b))
+        player.score = score
+        player.meeplesLeft = meeples_left
+        players.append(player)
+
+    completed = Counter()
+    count = data[offset]
+    offset += 1
+    for _type, n in _COMPLETED.iter_unpack(
+        data[offset : offset + count * _COMPLETED.size]
+    ):
+        completed[_type] = n
+    offset += count * _COMPLETED.size
+
+    type_id, rotation = _START.unpack_from(data, offset)
+    offset += _START.size
+    game = CarcassonneGame(
+        Tile(None, types[type_id], rotation), [], players, seed, shuffle=False
+    )
+    game.tile_types = list(types)
+    game.tileset_hash = compiled.hash
+    game.scorer.completed = completed
+
+    # put the placed tiles back in the order they were placed (linear in the number of tiles)
+    (count,) = _COUNT.unpack_from(data, offset)
+    offset += _COUNT.size
+    last = None
+    for type_id, flags, x, y, meeple, owner in _DRAWN.iter_unpack(
+        data[offset : offset + count * _DRAWN.size]
+    ):
+        tile = Tile(game, types[type_id], flags & 3)
+        game.drawn.append(tile)
+        if flags & _DISCARDED:
+            game.discarded.append(tile)
+            continue
+        tile.coords = Coords(x, y)
+        if meeple >= 0:
+            tile.features[meeple].meeple = players[owner]
+        last = tile
+        if phase == 0 or len(game.drawn) < count:
+            # in the meeple phase the last tile is placed again at the end
+            game._add_to_board(tile)
+    offset += count * _DRAWN.size
+
+    (count,) = _COUNT.unpack_from(data, offset)
+    offset += _COUNT.size
+    game.tileset = [
+        Tile(game, types[type_id])
+        for (type_id,) in _TYPE.iter_unpack(data[offset : offset + count * _TYPE.size])
+    ]
+    offset += count * _TYPE.size
+    (rotation,) = _ROTATION.unpack_from(data, offset)
+    offset += _ROTATION.size
+    if len(game.tileset) > 0:
+        game.tileset[-1].rotate(rotation)
+
+    (count,) = _COUNT.unpack_from(data, offset)
+    offset += _COUNT.size
+    game.history = [
+        Move(type_id, rotation, (x, y), meeple)
+        for type_id, x, y, rotation, meeple in _MOVE.iter_unpack(
+            data[offset : offset + count * _MOVE.size]
+        )
+    ]
+    offset += count * _MOVE.size
+    if offset != len(data):
+        raise ValueError("Trailing data in a saved game")
+
+    game.turn = turn
+    game.endScored = bool(end_scored)
+    game.startingTile.game = game
+    if phase == 1:
+        # place the last tile again, so the regions it closed are waiting to be scored
+        game.drawn.pop()
+        coords = last.coords
+        last.coords = None
+        game.tileset.append(last)
+        game.place_tile(coords)
+    else:
+        game.lastTile = last
+
+    game.journal.clear()
+    return game
@@ -1,212 +1,172 @@
 from logic.feature import Feature
-from typing import TYPE_CHECKING, Sequence
+from typing import TYPE_CHECKING
 from logic.const import FEATURE_TYPES
 from collections import Counter
-from logic.utils import is_nearby_feature
+from logic.trace import get_tracer
+import logging
 
 if TYPE_CHECKING:
     from logic.player import Player
+    from logic.regions import Region
 
+_trace = get_tracer("logic.scoring")
 
-class Scorer(object):
-    def __init__(self, parent):
-        self.parent = parent
-
-    def get_connected_features(self, feature: Feature) -> Sequence[Feature]:
-        """
-        Get all features that can be reached from a given feature (including itself)
-        """
-        visited = [feature]
-        toVisit = [feature]
 
-        while len(toVisit) > 0:
-            current = toVisit.pop(0)
-
-            for neighbor in current.bindings:
-                if neighbor not in visited:
-                    visited.append(neighbor)
-                    toVisit.append(neighbor)
+class Scorer(object):
+    """
+    Routing on the features and dealing with score
 
-        print(f"bfs output: {visited}")
+    Attributes
+    ----------
+    parent : CarcassonneGame
+        The game being scored
+    completed : Counter
+        Number of closed (completed) features scored during the game per feature type
+    """
 
-        return visited
+    def __init__(self, parent):
+        self.parent = parent
+        self.completed = Counter()
 
     def check_closed(self, feature: Feature) -> bool:
         """Check whether the feature is closed"""
-        if feature.type == FEATURE_TYPES.FARM:
-            return False
-
-        if feature.type == FEATURE_TYPES.CLOISTER:
-            coords = feature.parent_tile.coords
-            around = coords.get_coords_around()
-            return all([x in self.parent.board.keys() for x in around])
-
-        features = self.get_connected_features(feature)
-        # check whether all connected feature objects have the same number of bindings as connections
-        print(
-            f"check_closed on {feature}: {all([len(f.connections) == len(f.bindings) for f in features])}"
-        )
-        return all([len(f.connections) == len(f.bindings) for f in features])
-
-    def get_players_on_feature(self, feature: Feature) -> Sequence["Player"]:
-        """Get winning players on a given feature (with most meeples)"""
-        features = self.get_connected_features(feature)
-
-        players = []
-        for feature in features:
-            if feature.meeple is not None:
-                players.append(feature.meeple)
-
-        counter = Counter(players)
-        if len(counter) == 0:
-            return []
-        max_count = counter.most_common(1)[0][1]
-
-        output = []
-        for key, count in counter.items():
-            if count == max_count:
-                output.append(key)
-
-        return output
+        return feature.region.is_closed()
 
     def check_any_meeples(self, feature: Feature) -> bool:
         """Check if there are any meeples on the feature"""
-        features = self.get_connected_features(feature)
-
-        print("check any meeples:")
-        print([feature.parent_tile.coords for feature in features])
-
-        for feature in features:
-            if feature.meeple is not None:
-                return True
-
-        return False
+        return len(feature.region.meeple_features) > 0
 
     def remove_meeples(self, feature: Feature) -> set:
         """Return meeples to their owners when a feature is completed"""
         tiles = set()
-        features = self.get_connected_features(feature)
+        region = feature.region
+        self.parent.journal.record(
+            self._restore_meeples,
+            region,
+            [(feature, feature.meeple) for feature in region.meeple_features],
+            region.meeples.copy(),
+        )
 
-        for feature in features:
-            if feature.meeple is not None:
-                feature.meeple.plusMeeple()
-                feature.meeple = None
-                tiles.add(feature.parent_tile)
+        for feature in region.meeple_features:
+            feature.meeple.plusMeeple()
+            feature.meeple = None
+            tiles.add(feature.parent_tile)
 
-        print(f"tiles: {tiles}")
+        region.clear_meeples()
 
         return tiles
 
+    def _restore_meeples(self, region, meeples: list, tally: Counter) -> None:
+        """Put back meeples returned by `remove_meeples`"""
+        for feature, player in meeples:
+            feature.meeple = player
+            player.meeplesLeft -= 1
+        region.meeple_features = [feature for feature, _ in meeples]
+        region.meeples = tally
+
     def calculate_points_for_closed(self, feature: Feature) -> int:
         """Calculate points for a closed feature (returns 0 for open features)"""
         if not self.check_closed(feature) or feature.type == FEATURE_TYPES.FARM:
             return 0
-        features = self.get_connected_features(feature)
-
-        tiles = set()
-
-        s = 0
-
-        for feature in features:
-            feature.scored = True
-            if feature.parent_tile in tiles:
-                continue
+        region = feature.region
 
-            if feature.type == FEATURE_TYPES.CITY:
-                s += 2
-            elif feature.type == FEATURE_TYPES.PENNANT_CITY:
-                s += 4
-            elif feature.type == FEATURE_TYPES.CLOISTER:
-                s += 9
-            elif feature.type == FEATURE_TYPES.ROAD:
-                s += 1
-            else:
-                raise ValueError("Unknown feature type")
-
-        return s
-
-    def get_city_features_near(self, farm_feature: Feature) -> list:
-        """Get city features on the same tile that are touching the given feature (farm)"""
-        tile = farm_feature.parent_tile
-        return [
-            feature
-            for feature in tile.features
-            if is_nearby_feature(farm_feature, feature)
-        ]
+        if region.type == FEATURE_TYPES.CITY:
+            return 2 * len(region.tiles) + 2 * region.pennants
+        elif region.type == FEATURE_TYPES.CLOISTER:
+            return 9
+        elif region.type == FEATURE_TYPES.ROAD:
+            return len(region.tiles)
+        else:
+            raise ValueError("Unknown feature type")
 
     def count_closed_cities_near_farm(self, feature: Feature) -> int:
-        """Counts the number of cities touching the farm"""
-        features = self.get_connected_features(feature)
-        visited_cities = set()
-
-        for feature in features:
-            feature.scored = True
-            cities = [
-                frozenset(self.get_connected_features(f))
-                for f in self.get_city_features_near(feature)
-            ]
-            visited_cities.update(cities)
-
-        return len(visited_cities)
+        """Counts the number of closed cities touching the farm"""
+        return sum(1 for city in feature.region.adjacent if city.is_closed())
 
     def calculate_points_for_open(self, feature: Feature) -> int:
         """Calculates the points for an open feature (returns 0 for a closed feature)"""
-        if self.check_closed(feature) or feature.scored:
+        if self.check_closed(feature):
             return 0
-        features = self.get_connected_features(feature)
+        region = feature.region
 
-        tiles = set()
-
-        s = 0
-
-        if feature.type == FEATURE_TYPES.CLOISTER:
-            coords = feature.parent_tile.coords
-            around = coords.get_coords_around()
-            return sum([x in self.parent.board.keys() for x in around])
-
-        if feature.type == FEATURE_TYPES.FARM:
+        if region.type == FEATURE_TYPES.CLOISTER:
+            return region.around
+        elif region.type == FEATURE_TYPES.FARM:
             return 3 * self.count_closed_cities_near_farm(feature)
+        elif region.type == FEATURE_TYPES.CITY:
+            return len(region.tiles) + region.pennants
+        elif region.type == FEATURE_TYPES.ROAD:
+            return len(region.tiles)
+        else:
+            raise ValueError("Unknown feature type")
+
+    def score_closed_region(self, region: "Region") -> set:
+        """
+        Score a region closed by the last tile: count it as completed, pay its leaders and return their meeples
 
-        for feature in features:
-            if feature.scored:
-                return 0
-            feature.scored = True
-            if feature.parent_tile in tiles:
-                continue
-
-            if feature.type == FEATURE_TYPES.CITY:
-                s += 1
-            elif feature.type == FEATURE_TYPES.PENNANT_CITY:
-                s += 2
-            elif feature.type == FEATURE_TYPES.ROAD:
-                s += 1
-            else:
-                raise ValueError("Unknown feature type")
-
-        return s
-
-    def score_closed_feature(self, feature: Feature) -> set:
-        """Calculate points for closed feature -> update scores -> remove meeples"""
-        if not self.check_closed(feature):
+        Returns
+        -------
+        set[Tile]
+            Tiles the meeples have been taken from
+        """
+        journal = self.parent.journal
+        journal.record(
+            self.completed.__setitem__, region.type, self.completed[region.type]
+        )
+        self.completed[region.type] += 1
+        if len(region.meeple_features) == 0:
             return set()
 
-        score = self.calculate_points_for_closed(feature)
-        players = self.get_players_on_feature(feature)
+        score = self.calculate_points_for_closed(region.features[0])
+        players = region.get_leaders()
+        if _trace.isEnabledFor(logging.DEBUG):
+            _trace.debug(
+                "closed %s: %d points for %s",
+                region,
+                score,
+                [player.name for player in players],
+                extra={"data": {"type": region.type, "score": score}},
+            )
 
         for player in players:
+            journal.record(setattr, player, "score", player.score)
             player.addScore(score)
 
-        return self.remove_meeples(feature)
+        return self.remove_meeples(region.features[0])
 
-    def score_open_feature(self, feature: Feature) -> None:
-        """Calculate points for open features -> update scores -> remove meeples (just in case)"""
-        if self.check_closed(feature) or feature.scored:
-            return
+    def score_end(self) -> dict["Player", Counter]:
+        """
+        Score all open features at the end of the game in one pass over the regions (and return the meeples)
 
-        score = self.calculate_points_for_open(feature)
-        players = self.get_players_on_feature(feature)
+        Returns
+        -------
+        dict[Player, Counter]
+            Points every player got at the end per feature type (cities with pennants are cities)
+        """
+        journal = self.parent.journal
+        breakdown = {player: Counter() for player in self.parent.players}
 
-        for player in players:
-            player.addScore(score)
+        for region in self.parent.regions.regions:
+            if len(region.meeple_features) == 0 or region.is_closed():
+                continue
 
-        return self.remove_meeples(feature)
+            feature = region.features[0]
+            score = self.calculate_points_for_open(feature)
+            players = region.get_leaders()
+            if _trace.isEnabledFor(logging.DEBUG):
+                _trace.debug(
+                    "open %s: %d points for %s",
+                    region,
+                    score,
+                    [player.name for player in players],
+                    extra={"data": {"type": region.type, "score": score}},
+                )
+
+            for player in players:
+                journal.record(setattr, player, "score", player.score)
+                player.addScore(score)
+                breakdown[player][region.type] += score
+
+            self.remove_meeples(feature)
+
+        return breakdown
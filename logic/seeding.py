@@ -0,0 +1,38 @@
+"""
+Seeds and independent random streams
+
+Every game has one integer seed. Each use of randomness draws from its own stream derived from it
+(the order of the tiles, the order of the seats, every bot), so adding draws to one stream
+never changes the others, and the same seed gives the same game in any process, thread or Python run
+(`random.Random` seeded with a string hashes it with SHA-512, independently of PYTHONHASHSEED).
+"""
+import random
+import secrets
+
+TILES = "tiles"
+"""Stream shuffling the tileset"""
+SEATS = "seats"
+"""Stream shuffling the order of the players"""
+BOTS = "bots"
+"""Streams of the bots (one per seat)"""
+
+
+def new_seed() -> int:
+    """Get a fresh random 64-bit seed (for games started without one)"""
+    return secrets.randbits(64)
+
+
+def make_rng(seed: int, stream: str, *keys) -> random.Random:
+    """
+    Get the random number generator of a stream
+
+    Parameters
+    ----------
+    seed : int
+        Seed of the game
+    stream : str
+        Name of the stream (`TILES`, `SEATS`, `BOTS`, ...)
+    keys
+        Further keys splitting the stream (e.g. the seat of a bot)
+    """
+    return random.Random(":".join([str(seed), stream] + [str(key) for key in keys]))
@@ -0,0 +1,214 @@
+"""
+Self-play runner: plays many seeded headless games on a pool of processes and aggregates the results
+
+Run as a script::
+
+    python -m logic.selfplay --games 10000 --players 3 --processes 8
+"""
+from collections import namedtuple, Counter
+from functools import partial
+from logic.const import FEATURE_TYPES
+from logic.headless import DEFAULT_TILESET, Policy, RandomPolicy, run_game
+from logic.seeding import BOTS, make_rng
+from logic.trace import configure_from_env
+from multiprocessing import Pool
+from typing import Callable, Iterator, Sequence
+import argparse
+import math
+import os
+
+GameResult = namedtuple(
+    "GameResult",
+    ["seed", "scores", "winners", "tiles_placed", "unplaceable", "completed"],
+)
+GameResult.__doc__ = """
+Result of a single self-play game
+
+Attributes
+----------
+seed : int
+    Seed of the game
+scores : tuple[int]
+    Final scores by seat (in the order of the policies, not the shuffled turn order)
+winners : tuple[int]
+    Seats of the winners
+tiles_placed : int
+    Number of tiles on the board at the end (including the starting one)
+unplaceable : int
+    Number of drawn tiles that could not be placed anywhere
+completed : dict
+    Number of closed features during the game per feature type
+"""
+
+
+def random_policy(seed: int, seat: int) -> Policy:
+    """Default policy factory: a random policy seeded by the game seed and the seat"""
+    return RandomPolicy(make_rng(seed, BOTS, seat))
+
+
+def play_one(
+    seed: int,
+    players: int,
+    tileset: str = DEFAULT_TILESET,
+    policy_factory: Callable[[int, int], Policy] = random_policy,
+) -> GameResult:
+    """Play a single game and summarize it (runs in a worker process)"""
+    names = [f"Player {i + 1}" for i in range(players)]
+    policies = [policy_factory(seed, seat) for seat in range(players)]
+    game = run_game(seed, policies, tileset, names)
+
+    scores = {player.name: player.score for player in game.players}
+    winners = {player.name for player in game.get_winners()}
+
+    return GameResult(
+        seed,
+        tuple(scores[name] for name in names),
+        tuple(seat for seat, name in enumerate(names) if name in winners),
+        len(game.board),
+        len(game.discarded),
+        dict(game.scorer.completed),
+    )
+
+
+def run_selfplay(
+    games: int,
+    players: int = 2,
+    processes: int = None,
+    first_seed: int = 0,
+    tileset: str = DEFAULT_TILESET,
+    policy_factory: Callable[[int, int], Policy] = random_policy,
+) -> Iterator[GameResult]:
+    """
+    Play `games` games with seeds `first_seed`, `first_seed + 1`, ... on a pool of processes
+
+    Results are yielded as soon as the games finish (not in the order of the seeds).
+    `policy_factory` must be picklable (a module-level function)
+
+    Parameters
+    ----------
+    games : int
+        Number of games to play
+    players : int
+        Number of players in every game
+    processes : int
+        Number of worker processes (the number of CPUs by default)
+    first_seed : int
+        Seed of the first game
+    tileset : str
+        Filename of the tileset
+    policy_factory : Callable[[int, int], Policy]
+        Function making a policy for a (seed, seat) pair
+    """
+    worker = partial(
+        play_one, players=players, tileset=tileset, policy_factory=policy_factory
+    )
+    seeds = range(first_seed, first_seed + games)
+
+    if processes is None:
+        processes = os.cpu_count() or 1
+    chunksize = max(1, games // (processes * 16))
+
+    with Pool(processes) as pool:
+        yield from pool.imap_unordered(worker, seeds, chunksize)
+
+
+class SelfPlayStats(object):
+    """
+    Aggregated statistics of self-play games
+
+    Attributes
+    ----------
+    players : int
+        Number of players (seats) in every game
+    games : int
+        Number of games added
+    score_sums : list[int]
+        Sum of the final scores per seat
+    score_square_sums : list[int]
+        Sum of the squared final scores per seat
+    wins : list[int]
+        Number of games won (or tied for the win) per seat
+    tiles_placed : int
+        Sum of the tiles placed
+    unplaceable : int
+        Sum of the unplaceable tiles
+    unplaceable_games : int
+        Number of games with at least one unplaceable tile
+    completed : Counter
+        Sum of the closed features per feature type
+    """
+
+    def __init__(self, players: int) -> None:
+        self.players = players
+        self.games = 0
+        self.score_sums = [0] * players
+        self.score_square_sums = [0] * players
+        self.wins = [0] * players
+        self.tiles_placed = 0
+        self.unplaceable = 0
+        self.unplaceable_games = 0
+        self.completed = Counter()
+
+    def add(self, result: GameResult) -> None:
+        """Add the result of a single game"""
+        self.games += 1
+        for seat, score in enumerate(result.scores):
+            self.score_sums[seat] += score
+            self.score_square_sums[seat] += score * score
+        for seat in result.winners:
+            self.wins[seat] += 1
+        self.tiles_placed += result.tiles_placed
+        self.unplaceable += result.unplaceable
+        self.unplaceable_games += result.unplaceable > 0
+        self.completed.update(result.completed)
+
+    def summary(self) -> dict:
+        """Get the summary (means, standard deviations and rates) as a dictionary"""
+        if self.games == 0:
+            raise ValueError("No games to summarize")
+
+        n = self.games
+        means = [s / n for s in self.score_sums]
+        deviations = [
+            math.sqrt(max(0.0, sq / n - mean * mean))
+            for sq, mean in zip(self.score_square_sums, means)
+        ]
+        type_names = {value: name for name, value in FEATURE_TYPES._asdict().items()}
+
+        return {
+            "games": n,
+            "mean_scores": means,
+            "score_deviations": deviations,
+            "win_rates": [w / n for w in self.wins],
+            "mean_tiles_placed": self.tiles_placed / n,
+            "mean_unplaceable": self.unplaceable / n,
+            "unplaceable_game_rate": self.unplaceable_games / n,
+            "mean_completed": {
+                type_names[_type]: count / n
+                for _type, count in sorted(self.completed.items())
+            },
+        }
+
+
+def main(argv: Sequence[str] = None) -> None:
+    parser = argparse.ArgumentParser(description="Carcassonne self-play runner")
+    parser.add_argument("--games", "-n", type=int, default=1000)
+    parser.add_argument("--players", "-p", type=int, default=2)
+    parser.add_argument("--processes", "-j", type=int, default=None)
+    parser.add_argument("--seed", type=int, default=0, help="seed of the first game")
+    parser.add_argument("--tileset", default=DEFAULT_TILESET)
+    args = parser.parse_args(argv)
+    configure_from_env()
+
+    stats = SelfPlayStats(args.players)
+    for result in run_selfplay(
+        args.games, args.players, args.processes, args.seed, args.tileset
+    ):
+        stats.add(result)
+
+    for key, value in stats.summary().items():
+        print(f"{key}: {value}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,11 +1,15 @@
 from logic.feature import Feature
+from logic.tiletype import TileType
+from logic.utils import ALL_CONNECTIONS_MASK
 from typing import TYPE_CHECKING, Sequence
-import uuid
+import itertools
 
 if TYPE_CHECKING:
     from logic.game import CarcassonneGame
     from logic.feature import Connection
 
+_ids = itertools.count()
+
 
 class Tile(object):
     """
@@ -15,55 +19,79 @@ class Tile(object):
     ----------
     game : CarcassonneGame
         Game that this tile belongs to (doesn't have to be on the board yet)
+    type : TileType
+        Shared type of the tile (rotations, side signatures, ...)
+    rotation : int
+        Number of 90 degrees clockwise rotations from the type's orientation
     features : Sequence[Feature]
         Features that this tile consists of
-    uuid : UUID
-        Again, wrong debugging, probably could be omitted
+    id : int
+        Unique number of the tile (tiles are hashed by it and equal only to themselves)
     coords : Coords
         The coords of the tile on the board
     """
 
-    def __init__(self, game: "CarcassonneGame", features: Sequence[Feature]) -> None:
+    def __init__(
+        self, game: "CarcassonneGame", tile_type: TileType, rotation: int = 0
+    ) -> None:
         self.game = game
-        self.features = features
-        self.uuid = uuid.uuid4()
+        self.type = tile_type
+        self.rotation = rotation % 4
+        rotated = tile_type.rotations[self.rotation]
+        self.features: Sequence[Feature] = [
+            Feature(_type, conns, mask)
+            for _type, conns, mask in zip(
+                tile_type.feature_types, rotated.connections, rotated.masks
+            )
+        ]
+        for feature in self.features:
+            feature.parent_tile = self
+        self.id = next(_ids)
         self.coords = None
 
     def rotate(self, times: int) -> None:
         """Rotate the tile by 90 degrees clockwise `times` times"""
-        for feature in self.features:
-            feature.rotate(times)
+        self.rotation = (self.rotation + times) % 4
+        rotated = self.type.rotations[self.rotation]
+        for feature, conns, mask in zip(
+            self.features, rotated.connections, rotated.masks
+        ):
+            feature.connections = conns
+            feature.mask = mask
 
     def ensureCorrect(self) -> None:
         """Ensure that the tile is correct (features collectively have 12 unique connections)"""
-        conns = set()
+        conns = 0
         for feature in self.features:
             feature.parent_tile = self
-            for conn in feature.connections:
-                if conn in conns:
-                    raise AssertionError("Duplicate connection in a tile")
-                conns.add(conn)
+            if conns & feature.mask:
+                raise AssertionError("Duplicate connection in a tile")
+            conns |= feature.mask
 
-        if len(conns) != 12:
+        if conns != ALL_CONNECTIONS_MASK:
             raise AssertionError("A tile must have exactly 12 connections")
 
     def placeMeeple(self, ind, player) -> None:
         """Place a meeple of the given player on the feature with index `ind`"""
         player.minusMeeple()
-        self.features[ind].meeple = player
+        feature = self.features[ind]
+        feature.meeple = player
+        if feature.region is not None:
+            feature.region.add_meeple(feature)
 
     def get_feature_by_connection(self, connection: "Connection") -> Feature:
         """Return a feature belonging to this tile with the given connection"""
-        for feature in self.features:
-            if connection in feature.connections:
-                return feature
+        index = self.type.rotations[self.rotation].feature_by_connection[
+            connection.to_number()
+        ]
+        return self.features[index]
+
+    def get_side_signature(self, side: int) -> tuple:
+        """Get the side signature (feature types on the given side) of the tile as it is rotated now"""
+        return self.type.rotations[self.rotation].sides[side]
 
     def __repr__(self):
         return f"Tile[{';'.join([x.__repr__() for x in self.features])}]"
 
-    def __eq__(self, other):
-        return self.uuid == other.uuid
-
     def __hash__(self):
-        # a really bad practice here
-        return 0  # hash(self.features)
+        return self.id
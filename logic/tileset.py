@@ -0,0 +1,229 @@
+"""
+Compiled tilesets
+
+A tileset text file is parsed and validated once, then stored in a compact binary form
+keyed by the SHA-256 of the text (in a cache directory, see `get_cache_dir`).
+Later loads read the binary form instead of parsing the text,
+and within one process every tileset is built only once and shared by all the games using it
+(tile types are immutable).
+
+Binary format (little endian)::
+
+    header   : magic "CTS", version (u8), SHA-256 of the text (32 bytes),
+               number of tile types (u16), index of the starting tile type (u16, 0xFFFF for none)
+    per type : number of tiles (u16), number of features (u8)
+    per feature : feature type (u8), connection mask (u16)
+"""
+from collections import namedtuple
+from logic.const import FEATURE_TYPES
+from logic.tiletype import TileType
+from logic.trace import get_tracer
+import hashlib
+import os
+import struct
+
+_trace = get_tracer("logic.tileset")
+
+MAGIC = b"CTS"
+VERSION = 1
+NO_STARTING_TILE = 0xFFFF
+
+_HEADER = struct.Struct("<3sB32sHH")
+_TYPE = struct.Struct("<HB")
+_FEATURE = struct.Struct("<BH")
+
+_FEATURE_LETTERS = {
+    "F": FEATURE_TYPES.FARM,
+    "C": FEATURE_TYPES.CITY,
+    "P": FEATURE_TYPES.PENNANT_CITY,
+    "R": FEATURE_TYPES.ROAD,
+}
+
+CompiledTileset = namedtuple("CompiledTileset", ["hash", "types", "counts", "starting"])
+CompiledTileset.__doc__ = """
+Parsed and validated tileset
+
+Attributes
+----------
+hash : str
+    SHA-256 (hex) of the tileset text
+types : tuple[TileType]
+    Tile types, `types[i].id == i`
+counts : tuple[int]
+    Number of tiles of every type (including the starting tile)
+starting : int
+    Index of the type of the starting tile (None if the tileset doesn't mark one)
+"""
+
+_loaded = dict()
+"""Tilesets loaded in this process by their hash"""
+_hashes = dict()
+"""Hashes of tileset files by (path, modification time, size), so unchanged files are not read again"""
+
+
+def get_cache_dir() -> str:
+    """Directory of compiled tilesets: $CARCASSONNE_CACHE_DIR, or "carcassonne" in the user's cache directory"""
+    path = os.environ.get("CARCASSONNE_CACHE_DIR")
+    if path:
+        return path
+    base = os.environ.get("XDG_CACHE_HOME") or os.path.join(
+        os.path.expanduser("~"), ".cache"
+    )
+    return os.path.join(base, "carcassonne")
+
+
+def parse_feature(text: str) -> tuple[int, int]:
+    """Parse a single feature (e.g. "C3,4,5") into its type and connection mask"""
+    if text[0] == "M":
+        return FEATURE_TYPES.CLOISTER, 0
+    _type = _FEATURE_LETTERS.get(text[0])
+    if _type is None:
+        raise Exception("Unknown feature type")
+    mask = 0
+    for x in text[1:].split(","):
+        n = int(x)
+        if not 0 <= n < 12:
+            raise Exception(f"Wrong connection number: {n}")
+        mask |= 1 << n
+    return _type, mask
+
+
+def parse_tileset(text: str) -> CompiledTileset:
+    """Parse and validate the text form of a tileset"""
+    types = []
+    counts = []
+    starting = None
+
+    for line in text.splitlines():
+        line = line.strip()
+        if len(line) == 0:
+            continue
+
+        arr = line.split(" ")
+        if arr[0] == "S":
+            if starting is not None:
+                raise Exception("More than one starting tile in the tileset")
+            starting = len(types)
+            arr = arr[1:]
+
+        features = [parse_feature(feature) for feature in arr[1:]]
+        types.append(
+            TileType.from_masks(
+                len(types),
+                [_type for _type, _ in features],
+                [mask for _, mask in features],
+            )
+        )
+        counts.append(int(arr[0]))
+
+    return CompiledTileset(
+        hashlib.sha256(text.encode()).hexdigest(), tuple(types), tuple(counts), starting
+    )
+
+
+def compile_tileset(tileset: CompiledTileset) -> bytes:
+    """Encode a parsed tileset in the binary form"""
+    parts = [
+        _HEADER.pack(
+            MAGIC,
+            VERSION,
+            bytes.fromhex(tileset.hash),
+            len(tileset.types),
+            NO_STARTING_TILE if tileset.starting is None else tileset.starting,
+        )
+    ]
+    for tile_type, count in zip(tileset.types, tileset.counts):
+        masks = tile_type.rotations[0].masks
+        parts.append(_TYPE.pack(count, len(masks)))
+        for _type, mask in zip(tile_type.feature_types, masks):
+            parts.append(_FEATURE.pack(_type, mask))
+    return b"".join(parts)
+
+
+def load_compiled(data: bytes) -> CompiledTileset:
+    """Decode the binary form of a tileset (it has been validated when it was compiled)"""
+    magic, version, digest, n_types, starting = _HEADER.unpack_from(data, 0)
+    if magic != MAGIC or version != VERSION:
+        raise ValueError("Not a compiled tileset of a supported version")
+
+    offset = _HEADER.size
+    types = []
+    counts = []
+    for type_id in range(n_types):
+        count, n_features = _TYPE.unpack_from(data, offset)
+        offset += _TYPE.size
+        features = [
+            _FEATURE.unpack_from(data, offset + i * _FEATURE.size)
+            for i in range(n_features)
+        ]
+        offset += n_features * _FEATURE.size
+        types.append(
+            TileType.from_masks(
+                type_id,
+                [_type for _type, _ in features],
+                [mask for _, mask in features],
+                validate=False,
+            )
+        )
+        counts.append(count)
+
+    if offset != len(data):
+        raise ValueError("Trailing data in a compiled tileset")
+
+    return CompiledTileset(
+        digest.hex(),
+        tuple(types),
+        tuple(counts),
+        None if starting == NO_STARTING_TILE else starting,
+    )
+
+
+def _load_from_cache(digest: str, text: str) -> CompiledTileset:
+    """Load a compiled tileset from the cache directory, compiling (and storing) it if needed"""
+    path = os.path.join(get_cache_dir(), digest + ".cts")
+    try:
+        with open(path, "rb") as f:
+            tileset = load_compiled(f.read())
+        if tileset.hash == digest:
+            return tileset
+    except (OSError, ValueError, struct.error):
+        pass
+
+    _trace.debug("compiling tileset %s", digest)
+    tileset = parse_tileset(text)
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp = f"{path}.{os.getpid()}.tmp"
+        with open(tmp, "wb") as f:
+            f.write(compile_tileset(tileset))
+        os.replace(tmp, path)
+    except OSError as e:
+        _trace.warning("can't store the compiled tileset: %s", e)
+    return tileset
+
+
+def load_tileset(filename: str) -> CompiledTileset:
+    """
+    Load a tileset from its text file, using the compiled form when possible
+
+    Parameters
+    ----------
+    filename : str
+        Filename of the text form of the tileset
+    """
+    stat = os.stat(filename)
+    key = (os.path.abspath(filename), stat.st_mtime_ns, stat.st_size)
+    digest = _hashes.get(key)
+    if digest is not None:
+        return _loaded[digest]
+
+    with open(filename, "rb") as f:
+        text = f.read()
+    digest = hashlib.sha256(text).hexdigest()
+
+    tileset = _loaded.get(digest)
+    if tileset is None:
+        tileset = _load_from_cache(digest, text.decode())
+        _loaded[digest] = tileset
+    _hashes[key] = digest
+    return tileset
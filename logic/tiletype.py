@@ -0,0 +1,157 @@
+from collections import namedtuple
+from logic.const import FEATURE_TYPES
+from logic.utils import (
+    ALL_CONNECTIONS_MASK,
+    get_nearby_mask,
+    mask_to_connections,
+    rotate_mask,
+)
+from typing import Sequence
+
+TileRotation = namedtuple(
+    "TileRotation",
+    ["masks", "sides", "connections", "feature_by_connection", "adjacency"],
+)
+TileRotation.__doc__ = """
+Precomputed data of a tile type in one of the 4 rotations
+
+Attributes
+----------
+masks : tuple[int]
+    12-bit connection mask of every feature
+sides : tuple[tuple[int, int, int]]
+    Side signatures (feature types on each side, cities with pennants count as cities)
+connections : tuple[tuple[Connection]]
+    Connections of every feature
+feature_by_connection : tuple[int]
+    Index of the feature for each connection number (0 to 11)
+adjacency : tuple[int]
+    For every feature a bit mask of the features touching it (bit `i` is the feature with index `i`)
+"""
+
+
+class TileType(object):
+    """
+    Immutable kind of a tile shared by all the tiles of the kind, with all 4 rotations precomputed
+
+    Attributes
+    ----------
+    id : int
+        Index of the type in its tileset
+    feature_types : tuple[int]
+        Types of the features
+    rotations : tuple[TileRotation]
+        Precomputed data for rotations by 0, 90, 180 and 270 degrees clockwise
+    """
+
+    __slots__ = ("id", "feature_types", "rotations", "_fitting")
+
+    def __init__(
+        self,
+        type_id: int,
+        feature_types: Sequence[int],
+        connections: Sequence[Sequence[int]],
+    ) -> None:
+        masks = []
+        for feature_connections in connections:
+            mask = 0
+            for n in feature_connections:
+                mask |= 1 << n
+            masks.append(mask)
+
+        self._build(type_id, feature_types, masks, True)
+
+    @classmethod
+    def from_masks(
+        cls,
+        type_id: int,
+        feature_types: Sequence[int],
+        masks: Sequence[int],
+        validate: bool = True,
+    ) -> "TileType":
+        """Create a tile type from the connection masks of its features (in the unrotated orientation)"""
+        tile_type = cls.__new__(cls)
+        tile_type._build(type_id, feature_types, masks, validate)
+        return tile_type
+
+    def _build(
+        self,
+        type_id: int,
+        feature_types: Sequence[int],
+        masks: Sequence[int],
+        validate: bool,
+    ) -> None:
+        self.id = type_id
+        self.feature_types = tuple(feature_types)
+
+        if validate:
+            combined = 0
+            for mask in masks:
+                if combined & mask:
+                    raise AssertionError("Duplicate connection in a tile")
+                combined |= mask
+            if combined != ALL_CONNECTIONS_MASK:
+                raise AssertionError("A tile must have exactly 12 connections")
+
+        self.rotations = tuple(self._make_rotation(masks, times) for times in range(4))
+        self._fitting = dict()
+
+    def get_fitting_mask(self, required: tuple) -> int:
+        """
+        Get a 4-bit mask of the rotations fitting the required side signatures (bit `i` is rotation `i`)
+
+        Results are memoized: there are only a few distinct requirements in a tileset
+        """
+        mask = self._fitting.get(required)
+        if mask is None:
+            mask = 0
+            for times, rotated in enumerate(self.rotations):
+                if all(
+                    signature is None or signature == side
+                    for signature, side in zip(required, rotated.sides)
+                ):
+                    mask |= 1 << times
+            self._fitting[required] = mask
+        return mask
+
+    def _make_rotation(self, masks: Sequence[int], times: int) -> TileRotation:
+        """Compute the data of the tile type rotated `times` times"""
+        masks = tuple(rotate_mask(mask, times) for mask in masks)
+        connections = tuple(tuple(mask_to_connections(mask)) for mask in masks)
+
+        feature_by_connection = [0] * 12
+        for index, mask in enumerate(masks):
+            for n in range(12):
+                if mask >> n & 1:
+                    feature_by_connection[n] = index
+
+        def normalize(_type: int) -> int:
+            if _type == FEATURE_TYPES.PENNANT_CITY:
+                return FEATURE_TYPES.CITY
+            return _type
+
+        sides = tuple(
+            tuple(
+                normalize(self.feature_types[feature_by_connection[side * 3 + i]])
+                for i in range(3)
+            )
+            for side in range(4)
+        )
+
+        adjacency = []
+        for mask1 in masks:
+            nearby = get_nearby_mask(mask1)
+            adjacency.append(
+                sum(
+                    1 << index
+                    for index, mask2 in enumerate(masks)
+                    if mask2 & nearby != 0
+                )
+            )
+
+        return TileRotation(
+            masks, sides, connections, tuple(feature_by_connection), tuple(adjacency)
+        )
+
+    def __repr__(self):
+        return f"TileType[{self.id}]"
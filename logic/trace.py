@@ -0,0 +1,117 @@
+"""
+Leveled tracing for the logic and the view, built on the standard `logging` module
+
+Every subsystem (e.g. "logic.game", "logic.scoring", "view.widgets") has its own tracer with its own level.
+Everything is off by default: a disabled trace point is a single cached level check,
+expensive messages are only built behind `tracer.isEnabledFor(...)` and arguments are formatted lazily.
+
+Tracing can be turned on from code with `configure` or with environment variables (see `configure_from_env`)::
+
+    CARCASSONNE_TRACE="logic.game=DEBUG,view=INFO" CARCASSONNE_TRACE_JSON=1 python3 main.py
+"""
+import json
+import logging
+import os
+import sys
+from typing import Mapping, TextIO
+
+ROOT = "carcassonne"
+
+TRACE = 5
+"""Level below DEBUG, for trace points hit many times per move"""
+logging.addLevelName(TRACE, "TRACE")
+
+_root = logging.getLogger(ROOT)
+_root.addHandler(logging.NullHandler())
+_root.setLevel(logging.WARNING)
+
+
+def get_tracer(subsystem: str) -> logging.Logger:
+    """Get the tracer of a subsystem (for example "logic.scoring")"""
+    return logging.getLogger(f"{ROOT}.{subsystem}")
+
+
+class JsonLinesFormatter(logging.Formatter):
+    """Formats every record as a single JSON object per line (structured fields go in `extra={"data": {...}}`)"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        output = {
+            "time": record.created,
+            "level": record.levelname,
+            "subsystem": record.name[len(ROOT) + 1 :],
+            "message": record.getMessage(),
+        }
+        data = getattr(record, "data", None)
+        if data is not None:
+            output["data"] = data
+        if record.exc_info:
+            output["exception"] = self.formatException(record.exc_info)
+        return json.dumps(output, default=str)
+
+
+def _parse_level(level: int | str) -> int:
+    if isinstance(level, int):
+        return level
+    level = level.strip().upper()
+    if level.isdigit():
+        return int(level)
+    value = logging.getLevelName(level)
+    if not isinstance(value, int):
+        raise ValueError(f"Unknown trace level: {level}")
+    return value
+
+
+def configure(
+    levels: Mapping[str, int | str],
+    json_lines: bool = False,
+    stream: TextIO = None,
+) -> None:
+    """
+    Turn tracing on
+
+    Parameters
+    ----------
+    levels : Mapping[str, int | str]
+        Level per subsystem ("logic", "logic.scoring", ...); an empty name sets the level of all subsystems
+    json_lines : bool
+        Write JSON lines instead of plain text
+    stream : TextIO
+        Where to write the output (stderr by default)
+    """
+    handler = logging.StreamHandler(stream if stream is not None else sys.stderr)
+    if json_lines:
+        handler.setFormatter(JsonLinesFormatter())
+    else:
+        handler.setFormatter(
+            logging.Formatter("%(relativeCreated)d %(levelname)s %(name)s: %(message)s")
+        )
+
+    for handler_to_remove in list(_root.handlers):
+        _root.removeHandler(handler_to_remove)
+    _root.addHandler(handler)
+    _root.propagate = False
+
+    for subsystem, level in levels.items():
+        tracer = _root if subsystem == "" else get_tracer(subsystem)
+        tracer.setLevel(_parse_level(level))
+
+
+def configure_from_env() -> None:
+    """
+    Configure tracing from environment variables (does nothing if they are not set)
+
+    CARCASSONNE_TRACE : comma separated `subsystem=LEVEL` pairs (or just `LEVEL` for all subsystems)
+    CARCASSONNE_TRACE_JSON : write JSON lines if set to anything but "0"
+    """
+    spec = os.environ.get("CARCASSONNE_TRACE", "").strip()
+    if spec == "":
+        return
+
+    levels = {}
+    for item in spec.split(","):
+        if item.strip() == "":
+            continue
+        subsystem, _, level = item.rpartition("=")
+        levels[subsystem.strip()] = level
+
+    configure(levels, os.environ.get("CARCASSONNE_TRACE_JSON", "0") != "0")
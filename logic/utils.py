@@ -1,25 +1,17 @@
 from logic.const import *
 from logic.feature import Connection
-from typing import TYPE_CHECKING, Sequence
+from typing import Sequence
 from itertools import product
 
-if TYPE_CHECKING:
-    from logic.feature import Feature
-
 
 def invert_side(side: int) -> int:
     """Convert a side to its opposite (left-right, top-bottom)"""
     return (side + 2) % 4
 
 
-def get_side_conn_list(tile, side) -> list:
-    """Get a list of feature types with connections on the given side of the given tile (used for checking if a tile can be placed)"""
-    output = {}
-    for feature in tile.features:
-        for conn in feature.connections:
-            if conn.side == side:
-                output[conn.number] = feature.type
-    return [output[0], output[1], output[2]]
+def get_side_signature(tile, side) -> tuple:
+    """Get feature types on the given side of the given tile as a tuple (cities with pennants count as cities, so signatures of matching sides are equal after reversing one of them)"""
+    return tile.get_side_signature(side)
 
 
 def parse_connection_number(connection_number: int) -> Connection:
@@ -27,22 +19,30 @@ def parse_connection_number(connection_number: int) -> Connection:
     return Connection(connection_number // 3, connection_number % 3)
 
 
-def is_nearby_connection(conn1, conn2) -> bool:
-    """Check if feature with `conn1` connection is touching a feature with `conn2` connection"""
-    n1 = conn1.to_number()
-    n2 = conn2.to_number()
-    return abs(n1 - n2) == 1 or set([n1, n2]) == set([0, 12])
+ALL_CONNECTIONS_MASK = 0xFFF
+
+
+def mask_to_connections(mask: int) -> list[Connection]:
+    """Make a list of connections out of a 12-bit mask"""
+    return [parse_connection_number(n) for n in range(12) if mask >> n & 1]
+
+
+def rotate_mask(mask: int, times: int) -> int:
+    """Rotate a 12-bit connection mask by 90 degrees clockwise `times` times (each side is 3 bits)"""
+    shift = 3 * (times % 4)
+    return ((mask << shift) | (mask >> (12 - shift))) & ALL_CONNECTIONS_MASK
+
 
+def get_nearby_mask(mask: int) -> int:
+    """Get a mask of connections touching any connection in the given mask (neighbors around the edge of a tile)"""
+    return (
+        (mask << 1) | (mask >> 1) | (mask << 11) | (mask >> 11)
+    ) & ALL_CONNECTIONS_MASK
 
-def is_nearby_feature(f1: "Feature", f2: "Feature") -> bool:
-    """Check if two features are touching each other"""
-    conns1 = f1.connections
-    conns2 = f2.connections
-    for conn1, conn2 in product(conns1, conns2):
-        if is_nearby_connection(conn1, conn2):
-            return True
 
-    return False
+def coords_key(x: int, y: int) -> int:
+    """Integer key of a position, unique for every y between -2**31 and 2**31 (and any x)"""
+    return x << 32 | (y & 0xFFFFFFFF)
 
 
 class Coords(object):
@@ -62,7 +62,7 @@ class Coords(object):
     def get_coords_around(self) -> Sequence["Coords"]:
         """Returns a list of coords around and itself (to manage cloisters)"""
         return [
-            (Coords(self.x + x, self.y + y) for x, y in product([-1, 0, 1], repeat=2))
+            Coords(self.x + x, self.y + y) for x, y in product([-1, 0, 1], repeat=2)
         ]
 
     def to_tuple(self) -> tuple:
@@ -76,4 +76,4 @@ class Coords(object):
         return f"Coords({self.x}, {self.y})"
 
     def __hash__(self) -> int:
-        return self.x * 1000 + self.y
+        return coords_key(self.x, self.y)
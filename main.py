@@ -1,10 +1,15 @@
 from view.game import GameView
+from logic.trace import configure_from_env
+import multiprocessing
 
 
 def main():
+    configure_from_env()
     view = GameView()
     view.run()
 
 
 if __name__ == "__main__":
+    # bots search in worker processes, which needs this in frozen binaries
+    multiprocessing.freeze_support()
     main()
@@ -0,0 +1,96 @@
+"""Helpers shared by the tests: random games and a fingerprint of the whole state of a game"""
+from logic.game import CarcassonneGame
+from logic.headless import DEFAULT_TILESET
+import random
+
+
+def new_game(seed: int, players: int = 3) -> CarcassonneGame:
+    """Start a game on the default tileset"""
+    names = [f"Player {i + 1}" for i in range(players)]
+    return CarcassonneGame.from_file_and_names(DEFAULT_TILESET, names, seed)
+
+
+def play_move(game: CarcassonneGame, rng: random.Random) -> None:
+    """Place the current tile and a meeple at random"""
+    coords, rotation = rng.choice(game.legal_placements())
+    game.place_tile(coords, rotation)
+    game.placeMeeple(rng.choice(game.get_meeple_options()))
+
+
+def _feature_key(feature) -> tuple:
+    tile = feature.parent_tile
+    return (tile.coords.x, tile.coords.y, tile.features.index(feature))
+
+
+def _region_key(region) -> tuple:
+    return min(_feature_key(feature) for feature in region.features)
+
+
+def fingerprint(game: CarcassonneGame) -> dict:
+    """
+    Describe the whole state of a game by positions and type ids only,
+    so games rebuilt from scratch (clones, loaded or replayed games) can be compared to the original
+    """
+    regions = game.regions.regions
+    return {
+        "board": sorted(
+            (
+                coords.x,
+                coords.y,
+                tile.type.id,
+                tile.rotation,
+                tuple(f.meeple.name if f.meeple else None for f in tile.features),
+            )
+            for coords, tile in game.board.items()
+        ),
+        "regions": sorted(
+            (
+                _region_key(r),
+                r.type,
+                tuple(sorted(_feature_key(f) for f in r.features)),
+                r.open_edges,
+                tuple(sorted((p.name, n) for p, n in r.meeples.items() if n)),
+                tuple(sorted(_feature_key(f) for f in r.meeple_features)),
+                len(r.tiles),
+                r.pennants,
+                r.around,
+                tuple(sorted(_region_key(o) for o in r.adjacent)),
+            )
+            for r in regions
+        ),
+        "bindings": sorted(
+            (_feature_key(f), tuple(sorted(_feature_key(b) for b in f.bindings)))
+            for tile in game.board.values()
+            for f in tile.features
+        ),
+        "frontier": sorted((c.x, c.y, v) for c, v in game.frontier.items()),
+        "tileset": (
+            [tile.type.id for tile in game.tileset],
+            game.tileset[-1].rotation if game.tileset else None,
+        ),
+        "drawn": (
+            [tile.type.id for tile in game.drawn],
+            [tile.type.id for tile in game.discarded],
+        ),
+        "players": [(p.name, p.color, p.score, p.meeplesLeft) for p in game.players],
+        "state": (
+            game.turn,
+            game.phase,
+            game.endScored,
+            list(game.history),
+            dict(+game.scorer.completed),
+            game.seed,
+            game.tileset_hash,
+        ),
+        "closed": (
+            sorted(_region_key(r) for r in game.closedRegions)
+            if game.phase == 1
+            else None
+        ),
+        "last": game.lastTile.coords.to_tuple() if game.lastTile else None,
+        "watchers": sorted(
+            (key, tuple(sorted(_region_key(r) for r in watching)))
+            for key, watching in game.regions.watchers.items()
+            if watching
+        ),
+    }
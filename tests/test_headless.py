@@ -0,0 +1,33 @@
+from logic.headless import RandomPolicy, run_game
+import random
+import unittest
+
+
+def _scores(game) -> list[tuple[str, int]]:
+    return [(player.name, player.score) for player in game.players]
+
+
+class HeadlessTest(unittest.TestCase):
+    def test_seed_replays(self):
+        """The same seed plays the same game"""
+        first = run_game(42, [RandomPolicy(), RandomPolicy()])
+        second = run_game(42, [RandomPolicy(), RandomPolicy()])
+        self.assertEqual(first.history, second.history)
+        self.assertEqual(_scores(first), _scores(second))
+
+    def test_reused_policies(self):
+        """Policies playing several games get the streams of each game, not those of the first one"""
+        policies = [RandomPolicy(), RandomPolicy()]
+        for seed in (1, 2, 1):
+            game = run_game(seed, policies)
+            fresh = run_game(seed, [RandomPolicy(), RandomPolicy()])
+            self.assertEqual(game.history, fresh.history)
+            self.assertEqual(_scores(game), _scores(fresh))
+            self.assertTrue(all(policy.rng is None for policy in policies))
+
+    def test_own_rng_kept(self):
+        """A policy given a random number generator keeps using it"""
+        rng = random.Random(5)
+        policy = RandomPolicy(rng)
+        run_game(1, [policy, RandomPolicy()])
+        self.assertIs(policy.rng, rng)
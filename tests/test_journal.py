@@ -0,0 +1,69 @@
+from tests.helpers import fingerprint, new_game, play_move
+import random
+import unittest
+
+
+class JournalTest(unittest.TestCase):
+    def test_rollback(self):
+        """Rolling back a random lookahead (sometimes through the end scoring) restores the state"""
+        rng = random.Random(3)
+        game = new_game(3)
+        while not game.is_finished():
+            before = fingerprint(game)
+            snapshot = game.snapshot()
+            game.shuffle_remaining(rng)
+            for _ in range(rng.randint(1, 4)):
+                if game.is_finished():
+                    game.handleEnd()
+                    break
+                play_move(game, rng)
+            game.rollback(snapshot)
+            self.assertEqual(fingerprint(game), before)
+            play_move(game, rng)
+
+    def test_undo(self):
+        """Undo reverts a tile placement, a meeple placement and the end scoring one at a time"""
+        rng = random.Random(5)
+        game = new_game(5, players=2)
+        while not game.is_finished():
+            before = fingerprint(game)
+            game.place_tile(*rng.choice(game.legal_placements()))
+            placed = fingerprint(game)
+            game.placeMeeple(rng.choice(game.get_meeple_options()))
+            game.undo()
+            self.assertEqual(fingerprint(game), placed)
+            game.undo()
+            self.assertEqual(fingerprint(game), before)
+            play_move(game, rng)
+
+        before = fingerprint(game)
+        game.handleEnd()
+        game.undo()
+        self.assertEqual(fingerprint(game), before)
+
+    def test_clone(self):
+        """A clone has the same state, and playing on either of them leaves the other untouched"""
+        rng = random.Random(9)
+        game = new_game(9)
+        while not game.is_finished():
+            if rng.random() < 0.5:
+                game.place_tile(*rng.choice(game.legal_placements()))
+            clone = game.clone()
+            state = fingerprint(game)
+            self.assertEqual(fingerprint(clone), state)
+
+            if game.phase == 1:
+                clone.placeMeeple(rng.choice(clone.get_meeple_options()))
+            while not clone.is_finished():
+                play_move(clone, rng)
+            clone.handleEnd()
+            self.assertEqual(fingerprint(game), state)
+
+            if game.phase == 1:
+                game.placeMeeple(rng.choice(game.get_meeple_options()))
+            else:
+                play_move(game, rng)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,52 @@
+from logic.game import Move
+from logic.headless import DEFAULT_TILESET
+from logic.record import decode_record, encode_move, encode_record, get_record, replay
+from tests.helpers import fingerprint, new_game, play_move
+import random
+import unittest
+
+
+class RecordTest(unittest.TestCase):
+    def test_round_trip(self):
+        """Encoding and decoding a record gives the same record, replaying it gives the same game"""
+        for seed in range(3):
+            rng = random.Random(seed)
+            game = new_game(seed, players=2 + seed)
+            while not game.is_finished():
+                play_move(game, rng)
+            game.handleEnd()
+
+            record = get_record(game)
+            data = encode_record(record)
+            header = encode_record(record._replace(moves=[]))
+            self.assertEqual(len(data) - len(header), 4 * len(record.moves))
+            self.assertEqual(decode_record(data), record)
+            replayed = replay(decode_record(data), DEFAULT_TILESET)
+            self.assertEqual(fingerprint(replayed), fingerprint(game))
+
+    def test_replay_prefix(self):
+        """Replaying the first moves of a record rebuilds the game as it was after them"""
+        rng = random.Random(11)
+        game = new_game(11)
+        states = [fingerprint(game)]
+        while not game.is_finished():
+            play_move(game, rng)
+            states.append(fingerprint(game))
+
+        record = decode_record(encode_record(get_record(game)))
+        for moves in (0, 1, 10, len(states) // 2, len(states) - 1):
+            replayed = replay(record, DEFAULT_TILESET, moves)
+            self.assertEqual(fingerprint(replayed), states[moves])
+
+    def test_rejects_bad_data(self):
+        data = encode_record(get_record(new_game(1)))
+        with self.assertRaises(ValueError):
+            decode_record(b"XYZ" + data[3:])
+        with self.assertRaises(ValueError):
+            decode_record(data + b"\0")
+        with self.assertRaises(ValueError):
+            encode_move(Move(0, 0, (200, 0), -1))
+
+
+if __name__ == "__main__":
+    unittest.main()
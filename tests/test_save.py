@@ -0,0 +1,72 @@
+from logic.headless import DEFAULT_TILESET
+from logic.save import load_game, save_game
+from tests.helpers import fingerprint, new_game, play_move
+import os
+import random
+import tempfile
+import unittest
+from unittest import mock
+
+
+class SaveTest(unittest.TestCase):
+    def test_round_trip(self):
+        """Every state of a game (both phases of every turn and the scored end) loads back the same"""
+        for seed in range(2):
+            rng = random.Random(seed)
+            game = new_game(seed)
+            while True:
+                data = save_game(game)
+                loaded = load_game(data, DEFAULT_TILESET)
+                self.assertEqual(fingerprint(loaded), fingerprint(game))
+                self.assertEqual(save_game(loaded), data)
+
+                if game.endScored:
+                    break
+                if game.is_finished():
+                    game.handleEnd()
+                elif game.phase == 0:
+                    game.tileset[-1].rotate(rng.randint(0, 3))
+                    game.place_tile(*rng.choice(game.legal_placements()))
+                else:
+                    game.placeMeeple(rng.choice(game.get_meeple_options()))
+
+    def test_loaded_game_plays_on(self):
+        """A loaded game (saved in the meeple phase) continues exactly like the original"""
+        rng = random.Random(7)
+        game = new_game(7, players=2)
+        for _ in range(30):
+            play_move(game, rng)
+        game.place_tile(*rng.choice(game.legal_placements()))
+        loaded = load_game(save_game(game), DEFAULT_TILESET)
+
+        state = rng.getstate()
+        for g in (game, loaded):
+            rng.setstate(state)
+            g.placeMeeple(rng.choice(g.get_meeple_options()))
+            while not g.is_finished():
+                play_move(g, rng)
+            g.handleEnd()
+        self.assertEqual(fingerprint(loaded), fingerprint(game))
+
+    def test_rejects_bad_data(self):
+        game = new_game(1)
+        data = save_game(game)
+        with self.assertRaises(ValueError):
+            load_game(b"XYZ" + data[3:], DEFAULT_TILESET)
+        with self.assertRaises(ValueError):
+            load_game(data + b"\0", DEFAULT_TILESET)
+
+        with tempfile.TemporaryDirectory() as directory:
+            other = os.path.join(directory, "tileset")
+            with open(DEFAULT_TILESET, "r") as f:
+                text = f.read()
+            with open(other, "w") as f:
+                f.write(text + "\n1 F0,1,2,3,4,5,6,7,8,9,10,11\n")
+            # keep the compiled test tileset out of the user's cache
+            with mock.patch.dict(os.environ, {"CARCASSONNE_CACHE_DIR": directory}):
+                with self.assertRaises(ValueError):
+                    load_game(data, other)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,169 @@
+"""
+Shared images of tiles
+
+Every tile of the same type and rotation with the same meeples looks the same, so its image is rendered once
+and shared by all the tile widgets of a board. The shape of a tile (features and the points meeples are drawn at)
+is rendered once per type and rotation, tiles with meeples only draw them on a copy of it.
+"""
+import pygame as pg
+from collections import OrderedDict
+from logic.const import FEATURE_TYPES
+from logic.tile import Tile
+from view.const import COLORS, SCALED_CACHE_SIZE
+from view.utils import deCornify
+from logic.trace import get_tracer
+
+_trace = get_tracer("view.widgets")
+
+_CONNECTION_POINTS = (
+    (0, 1),
+    (0, 1 / 2),
+    (0, 0),
+    (0, 0),
+    (1 / 2, 0),
+    (1, 0),
+    (1, 0),
+    (1, 1 / 2),
+    (1, 1),
+    (1, 1),
+    (1 / 2, 1),
+    (0, 1),
+)
+"""Points of the connections (by their numbers) on a tile of size 1"""
+
+
+def _mean(points) -> tuple[float, float]:
+    """Centroid of the points"""
+    n = len(points)
+    return (sum(p[0] for p in points) / n, sum(p[1] for p in points) / n)
+
+
+class TileAtlas(object):
+    """
+    Images of tiles shared by all the tile widgets of a board
+
+    Attributes
+    ----------
+    tile_size : int
+        Size of the tile images (before zooming)
+    """
+
+    def __init__(self, tile_size: int, scaled_size: int = SCALED_CACHE_SIZE) -> None:
+        self.tile_size = tile_size
+        self._shapes = dict()
+        self._images = dict()
+        self._scaled = OrderedDict()
+        self._scaled_size = scaled_size
+
+    @staticmethod
+    def get_key(tile: Tile) -> tuple:
+        """Key of the look of the tile: its type, rotation and the meeples on it (feature index and color)"""
+        return (
+            tile.type.id,
+            tile.rotation,
+            tuple(
+                (index, tuple(feature.meeple.color))
+                for index, feature in enumerate(tile.features)
+                if feature.meeple is not None
+            ),
+        )
+
+    def _render_shape(self, tile: Tile) -> tuple[pg.Surface, tuple]:
+        """Draw the features of the tile (without meeples) and find the points meeples are drawn at"""
+        size = self.tile_size
+        img = pg.Surface((size, size))
+        img.fill(COLORS.FARM)
+
+        feature_points = []
+        middle_point = (size / 2, size / 2)
+        cloisterOnTile = FEATURE_TYPES.CLOISTER in tile.type.feature_types
+        for feature in tile.features:
+            points = [
+                (x * size, y * size)
+                for x, y in (_CONNECTION_POINTS[c.to_number()] for c in feature.connections)
+            ]
+
+            if feature.type == FEATURE_TYPES.CLOISTER:
+                pg.draw.circle(img, COLORS.CLOISTER, middle_point, size / 4, 0)
+                feature_points.append(middle_point)
+            elif (
+                feature.type == FEATURE_TYPES.CITY
+                or feature.type == FEATURE_TYPES.PENNANT_CITY
+            ):
+                additional_point = _mean([*points, middle_point])
+
+                if additional_point != middle_point:
+                    points.append(additional_point)
+                else:
+                    if len(points) == 6:
+                        points.insert(3, _mean([points[2], points[3], middle_point]))
+                        points.append(_mean([points[6], points[0], middle_point]))
+
+                col = COLORS.CITY
+                if feature.type == FEATURE_TYPES.PENNANT_CITY:
+                    col = COLORS.PENNANT_CITY
+                pg.draw.polygon(img, col, points, 0)
+
+                feature_points.append(_mean(points))
+            elif feature.type == FEATURE_TYPES.ROAD:
+                if len(points) == 1:
+                    points.append(middle_point)
+
+                pg.draw.line(img, COLORS.ROAD, points[0], points[1], 5)
+
+                feature_points.append(_mean(points))
+            elif feature.type == FEATURE_TYPES.FARM:
+                # already the green background
+                if cloisterOnTile:
+                    feature_points.append((1 / 4 * size, 1 / 4 * size))
+                else:
+                    feature_points.append(_mean(points))
+            else:
+                raise ValueError("Incorrect feature type")
+
+        _trace.debug("rendering tile type %s done: %s", tile.type.id, feature_points)
+        return img, tuple(feature_points)
+
+    def get_image(self, tile: Tile) -> tuple[tuple, pg.Surface, tuple]:
+        """
+        Get the image of the tile, rendering it only if no tile looked the same before
+
+        Returns
+        -------
+        tuple
+            Key of the look of the tile (see `get_key`)
+        pg.Surface
+            The image (shared, must not be drawn on)
+        tuple
+            Points of the features (where meeples are drawn)
+        """
+        key = self.get_key(tile)
+        shape = key[:2]
+        img, feature_points = self._shapes.get(shape, (None, None))
+        if img is None:
+            img, feature_points = self._render_shape(tile)
+            self._shapes[shape] = (img, feature_points)
+
+        if len(key[2]) > 0:
+            with_meeples = self._images.get(key)
+            if with_meeples is None:
+                with_meeples = img.copy()
+                for index, color in key[2]:
+                    x, y = deCornify(feature_points[index], self.tile_size)
+                    pg.draw.rect(with_meeples, color, ((x - 10, y - 10), (20, 20)))
+                self._images[key] = with_meeples
+            img = with_meeples
+
+        return key, img, feature_points
+
+    def get_scaled(self, key: tuple, img: pg.Surface, size: int) -> pg.Surface:
+        """Get the image with the given key scaled to the given size, keeping the recently used ones"""
+        scaled = self._scaled.get((key, size))
+        if scaled is None:
+            scaled = pg.transform.scale(img, (size, size))
+            self._scaled[(key, size)] = scaled
+            if len(self._scaled) > self._scaled_size:
+                self._scaled.popitem(last=False)
+        else:
+            self._scaled.move_to_end((key, size))
+        return scaled
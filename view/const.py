@@ -1,5 +1,6 @@
 from pygame.locals import *
 from collections import namedtuple
+import os
 
 COLORS = namedtuple("COLORS", ["FARM", "ROAD", "CITY", "PENNANT_CITY", "CLOISTER"])(
     Color("mediumseagreen"),
@@ -10,3 +11,15 @@ COLORS = namedtuple("COLORS", ["FARM", "ROAD", "CITY", "PENNANT_CITY", "CLOISTER
 )
 
 FONT_SIZE = 40
+
+SCALED_CACHE_SIZE = 512  # scaled tile images (a look of a tile at a zoom level) kept by the atlas of a board
+
+HUMAN_SEAT = "Human"
+BOT_SEAT = "Bot"
+
+FPS = int(os.environ.get("CARCASSONNE_FPS", 60))  # frames per second at most
+IDLE_WAIT = 0.25  # seconds between frames while waiting for input (for pygame_gui timers)
+STATS_INTERVAL = 5.0  # seconds between traced frame time stats
+
+BOT_TIME_LIMIT = 2.0  # seconds per move
+BOT_WORKERS = max(1, (os.cpu_count() or 1) - 1)
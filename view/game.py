@@ -1,14 +1,77 @@
 import pygame as pg
 from pygame.locals import *
 import pygame_gui as gui
+from concurrent.futures import ThreadPoolExecutor
 from view.scenes import WelcomeScene, GameScene, EndScene
+from view.const import FPS, IDLE_WAIT, STATS_INTERVAL
+from logic.trace import get_tracer
+import time
 
+_trace = get_tracer("view.game")
 
-class GameView(object):
-    """Manages the whole graphics of the game"""
+
+class FrameStats(object):
+    """
+    Times of the work done in frames (not counting the time spent waiting)
+
+    Attributes
+    ----------
+    frames : int
+        Number of frames
+    idle : int
+        Number of frames that waited for input first
+    total : float
+        Time of all the frames in seconds
+    worst : float
+        Time of the longest frame in seconds
+    """
 
     def __init__(self) -> None:
+        self.frames = 0
+        self.idle = 0
+        self.total = 0.0
+        self.worst = 0.0
+
+    def add(self, seconds: float, idle: bool) -> None:
+        self.frames += 1
+        self.idle += idle
+        self.total += seconds
+        self.worst = max(self.worst, seconds)
+
+    def get_mean(self) -> float:
+        """Mean time of a frame in seconds"""
+        return self.total / self.frames if self.frames > 0 else 0.0
+
+    def as_dict(self) -> dict:
+        return {
+            "frames": self.frames,
+            "idle": self.idle,
+            "mean_ms": self.get_mean() * 1000,
+            "worst_ms": self.worst * 1000,
+        }
+
+    def __repr__(self) -> str:
+        return f"FrameStats[{self.frames} frames ({self.idle} idle);mean {self.get_mean() * 1000:.2f} ms;worst {self.worst * 1000:.2f} ms]"
+
+
+class GameView(object):
+    """
+    Manages the whole graphics of the game
+
+    Attributes
+    ----------
+    fps : int
+        Maximum number of frames per second
+    stats : FrameStats
+        Times of all the frames so far
+    botExecutor : ThreadPoolExecutor
+        Thread the bots think in (outside of the main loop)
+    """
+
+    def __init__(self, fps: int = FPS) -> None:
         self.game = None
+        self.bots = dict()
+        self.botExecutor = ThreadPoolExecutor(1, thread_name_prefix="bot")
 
         pg.init()
         self.screen = pg.display.set_mode((800, 800), RESIZABLE)
@@ -16,7 +79,10 @@ class GameView(object):
         self.running = True
 
         self.clock = pg.time.Clock()
+        self.fps = fps
+        self.stats = FrameStats()
         self.ui_manager = gui.UIManager((800, 800))
+        self.uiImages = dict()
 
         self.scenes = [WelcomeScene(self), GameScene(self), EndScene(self)]
         self.scene = self.scenes[0]
@@ -24,11 +90,30 @@ class GameView(object):
         self.scene.setup()
 
     def run(self) -> None:
-        time_delta = self.clock.tick(60) / 1000.0
+        """
+        Run the main loop: at most `fps` frames per second, and while nothing changes on screen
+        and no input comes, sleep until an event arrives (waking up every `IDLE_WAIT` seconds for pygame_gui)
+        """
+        idle = False
+        window = FrameStats()
+        windowStart = time.perf_counter()
+        self.clock.tick()
         while self.running:
-            for event in pg.event.get():
+            events = pg.event.get()
+            waited = idle and len(events) == 0
+            if waited:
+                event = pg.event.wait(int(IDLE_WAIT * 1000))
+                if event.type != NOEVENT:
+                    events = [event] + pg.event.get()
+            time_delta = self.clock.tick(self.fps) / 1000.0
+            start = time.perf_counter()
+
+            fullUpdate = False
+            for event in events:
                 if event.type == QUIT:
                     self.running = False
+                elif event.type == WINDOWEXPOSED:
+                    fullUpdate = True
                 self.ui_manager.process_events(event)
                 self.scene.process_events(event)
 
@@ -37,10 +122,51 @@ class GameView(object):
             self.scene.draw()
             self.ui_manager.draw_ui(self.screen)
 
-            pg.display.update()
+            dirty = self.scene.take_dirty()
+            uiDirty = self._get_ui_changes()
+            if dirty is None or fullUpdate:
+                pg.display.update()
+            elif len(dirty) + len(uiDirty) > 0:
+                pg.display.update(dirty + uiDirty)
+
+            # without input the screen changes only when pygame_gui or the scene animate something
+            idle = (
+                len(events) == 0
+                and len(uiDirty) == 0
+                and not self.scene.is_animating()
+            )
 
+            end = time.perf_counter()
+            self.stats.add(end - start, waited)
+            window.add(end - start, waited)
+            if end - windowStart >= STATS_INTERVAL:
+                _trace.debug("frames: %s", window, extra={"data": window.as_dict()})
+                window = FrameStats()
+                windowStart = end
+
+        _trace.info("frames: %s", self.stats, extra={"data": self.stats.as_dict()})
+        # a bot still thinking finishes within its time limit
+        self.botExecutor.shutdown(cancel_futures=True)
+        for bot in self.bots.values():
+            bot.close()
         pg.quit()
 
+    def _get_ui_changes(self) -> list[pg.Rect]:
+        """Get the parts of the screen where pygame_gui elements changed their image since the last frame"""
+        changes = []
+        images = dict()
+        for element in self.ui_manager.get_sprite_group().sprites():
+            if not element.visible:
+                continue
+            images[element] = (element.image, pg.Rect(element.rect))
+            if self.uiImages.get(element) != images[element]:
+                changes.append(images[element][1])
+        for element, (_, rect) in self.uiImages.items():
+            if element not in images:
+                changes.append(rect)
+        self.uiImages = images
+        return changes
+
     def nextScene(self) -> None:
         self.sceneIndex += 1
         if self.sceneIndex >= len(self.scenes):
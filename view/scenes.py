@@ -5,27 +5,97 @@ import pygame_gui as gui
 from pygame_gui.elements.ui_text_entry_line import UITextEntryLine
 from view.ui_widgets import TextWidget, BoardWidget, InfoWidget
 from view.utils import alignMousePosition, deCornify
-from view.const import FONT_SIZE
+from view.const import FONT_SIZE, HUMAN_SEAT, BOT_SEAT, BOT_TIME_LIMIT, BOT_WORKERS
 from logic.game import CarcassonneGame
+from logic.headless import Policy
+from logic.mcts import MCTSPolicy
+from logic.seeding import BOTS
 from logic.utils import Coords
-import numpy as np
-import traceback
+from logic.trace import get_tracer
+
+_trace = get_tracer("view.scenes")
+
+
+def _think(policy: Policy, game: CarcassonneGame) -> tuple[Coords, int, int]:
+    """
+    Let a bot choose its move on a copy of the game (runs in a background thread)
+
+    Returns
+    -------
+    Coords
+        Coords to place the tile on
+    int
+        Rotation of the placed tile (from the orientation of its type)
+    int
+        Feature to put a meeple on (-1 for none)
+    """
+    coords, turns = policy.choose_placement(game, game.legal_placements())
+    rotation = (game.tileset[-1].rotation + turns) % 4
+    game.place_tile(coords, turns)
+    return coords, rotation, policy.choose_meeple(game, game.get_meeple_options())
 
 
 class Scene:
+    tracks_dirty = False
+    """Whether the scene reports the parts of the screen it changed (otherwise the whole screen is updated every frame)"""
+
     def __init__(self, parent, background_color) -> None:
         self.parent = parent
         self.background_color = background_color
-        x, y = self.parent.screen.get_size()
-        self.background = pg.Surface((x, y))
-        self.background.fill(self.background_color)
+        self.dirty = None
 
         self.clear()
 
     def clear(self) -> None:
-        """Draw background on top to clear the screen"""
-        x, y = self.parent.screen.get_size()
-        self.parent.screen.blit(pg.transform.scale(self.background, (x, y)), (0, 0))
+        """Draw background on top to clear the screen (the whole screen is redrawn in this frame)"""
+        self.parent.screen.fill(self.background_color)
+        self.dirty = None
+
+    def erase(self, rect: pg.Rect) -> None:
+        """Draw background over a part of the screen"""
+        self.parent.screen.fill(self.background_color, rect)
+        self.mark_dirty(rect)
+
+    def erase_ui(self) -> list[pg.Rect]:
+        """
+        Draw background under the visible pygame_gui elements
+
+        The elements are drawn over the screen in every frame and their transparent parts (like the background of labels)
+        would blend with their image from the last frame, so what is under them has to be drawn again first
+
+        Returns
+        -------
+        list[pg.Rect]
+            The parts of the screen erased
+        """
+        manager = self.parent.ui_manager
+        root = manager.get_root_container()
+        rects = []
+        for element in manager.get_sprite_group().sprites():
+            if element.visible and element is not root:
+                rect = pg.Rect(element.rect)
+                self.erase(rect)
+                rects.append(rect)
+        return rects
+
+    def mark_dirty(self, rect: pg.Rect) -> None:
+        """Mark a part of the screen as changed in this frame"""
+        if self.dirty is not None:
+            self.dirty.append(pg.Rect(rect))
+
+    def is_dirty(self, rect: pg.Rect) -> bool:
+        """Check whether a part of the screen overlaps anything changed in this frame"""
+        return self.dirty is None or pg.Rect(rect).collidelist(self.dirty) >= 0
+
+    def take_dirty(self) -> list[pg.Rect]:
+        """Get the parts of the screen changed since the last call (None if the whole screen has to be updated)"""
+        dirty = self.dirty
+        self.dirty = [] if self.tracks_dirty else None
+        return dirty
+
+    def is_animating(self) -> bool:
+        """Check whether the scene changes in the next frame even without any input"""
+        return False
 
     @abstractmethod
     def draw(self) -> None:
@@ -111,12 +181,23 @@ class WelcomeScene(Scene):
                     self.nameInputs = list(
                         map(
                             lambda x: UITextEntryLine(
-                                relative_rect=pg.rect.Rect(200, 200 + 60 * x, 400, 50),
+                                relative_rect=pg.rect.Rect(200, 200 + 60 * x, 280, 50),
                                 manager=self.parent.ui_manager,
                             ),
                             range(self.data["numPlayers"]),
                         )
                     )
+                    self.seatInputs = list(
+                        map(
+                            lambda x: gui.elements.UIDropDownMenu(
+                                [HUMAN_SEAT, BOT_SEAT],
+                                HUMAN_SEAT,
+                                pg.rect.Rect(490, 200 + 60 * x, 110, 50),
+                                self.parent.ui_manager,
+                            ),
+                            range(self.data["numPlayers"]),
+                        )
+                    )
                     self.label.set_text("Enter names:")
                 else:
                     if not self.validateNames():
@@ -127,7 +208,18 @@ class WelcomeScene(Scene):
                     self.parent.game = CarcassonneGame.from_file_and_names(
                         "assets/default_tileset", self.data["names"]
                     )
-                    for field in self.nameInputs:
+                    self.parent.bots = {
+                        name: MCTSPolicy(
+                            time_limit=BOT_TIME_LIMIT,
+                            workers=BOT_WORKERS,
+                            rng=self.parent.game.get_rng(BOTS, seat),
+                        )
+                        for seat, (name, seatInput) in enumerate(
+                            zip(self.data["names"], self.seatInputs)
+                        )
+                        if seatInput.selected_option == BOT_SEAT
+                    }
+                    for field in self.nameInputs + self.seatInputs:
                         field.hide()
                     self.label.hide()
                     self.parent.nextScene()
@@ -139,11 +231,16 @@ class WelcomeScene(Scene):
 class GameScene(Scene):
     """Scene for the actual gameplay"""
 
+    tracks_dirty = True
+
     def __init__(self, parent) -> None:
         super().__init__(parent, Color("blue"))
         self.board = BoardWidget(self, 200)
         self.boardZoom = 1.0
         self.meeplePointer = -1
+        self.drawnPointer = -1
+        self.pointerRect = None
+        self.botMove = None
 
         self.meeplePointerImage = pg.Surface((20, 20))
         self.turnPointer = pg.Surface((50, 50))
@@ -151,6 +248,11 @@ class GameScene(Scene):
         pg.draw.polygon(self.turnPointer, Color("red"), [(10, 25), (40, 10), (40, 40)])
 
     def draw(self) -> None:
+        if self.is_bot_turn():
+            self.play_bot_turn()
+            if self.parent.scene is not self:
+                return
+
         if self.phase == 0:
             if self.info_widget.instruction_text != "Place a tile":
                 self.clear()
@@ -164,37 +266,49 @@ class GameScene(Scene):
                 self.info_widget.instruction.set_text("Place a meeple")
                 self.info_widget.instruction_text = "Place a meeple"
 
+        if self.dirty is not None:
+            for rect in self.erase_ui():
+                self.board.redraw(rect)
+
+        pointer = self.meeplePointer if self.phase == 1 else -1
+        pointerMoved = pointer != self.drawnPointer
+        if pointerMoved and self.pointerRect is not None:
+            # erase the old pointer and draw the tiles under it again (it can stick out of its tile)
+            self.erase(self.pointerRect)
+            self.board.redraw(self.pointerRect)
+            self.pointerRect = None
+        self.drawnPointer = pointer
+
         self.board.draw()
 
-        if self.phase == 1 and self.meeplePointer != -1:
-            self.meeplePointerImage.fill(self.parent.game.get_current_player_color())
-            self.parent.screen.blit(
-                pg.transform.scale(
-                    self.meeplePointerImage, (self.boardZoom * 20, self.boardZoom * 20)
-                ),
-                tuple(
-                    map(
-                        sum,
-                        zip(
-                            self.board.board[self.board.lastPos].pos,
-                            np.array(
-                                deCornify(
-                                    self.board.board[self.board.lastPos].feature_points[
-                                        self.meeplePointer
-                                    ],
-                                    self.board.tile_size,
-                                )
-                            )
-                            * self.boardZoom,
-                            (-10 * self.boardZoom, -10 * self.boardZoom),
-                        ),
-                    )
-                ),
+        if pointer != -1:
+            lastTile = self.board.board[self.board.lastPos]
+            lastTile.update_layout()
+            size = self.boardZoom * 20
+            x, y = deCornify(lastTile.feature_points[pointer], self.board.tile_size)
+            rect = pg.Rect(
+                lastTile.pos[0] + (x - 10) * self.boardZoom,
+                lastTile.pos[1] + (y - 10) * self.boardZoom,
+                size,
+                size,
             )
+            if pointerMoved or self.is_dirty(rect):
+                self.meeplePointerImage.fill(
+                    self.parent.game.get_current_player_color()
+                )
+                self.parent.screen.blit(
+                    pg.transform.scale(self.meeplePointerImage, (size, size)),
+                    rect.topleft,
+                )
+                self.mark_dirty(rect)
+                self.pointerRect = rect
 
         self.info_widget.draw()
         turn = self.parent.game.turn
-        self.parent.screen.blit(self.turnPointer, ((200, 100 + turn * 50)))
+        rect = pg.Rect(200, 100 + turn * 50, 50, 50)
+        if self.is_dirty(rect):
+            self.parent.screen.blit(self.turnPointer, rect.topleft)
+            self.mark_dirty(rect)
 
     def setup(self) -> None:
         self.clear()
@@ -204,6 +318,55 @@ class GameScene(Scene):
 
         self.info_widget = InfoWidget(self, self.parent.game.players)
 
+    def is_animating(self) -> bool:
+        # frames keep coming while a bot thinks, to make its move as soon as it is chosen
+        return self.is_bot_turn()
+
+    def is_bot_turn(self) -> bool:
+        """Check whether the current player is a bot"""
+        return (
+            self.phase == 0
+            and self.parent.game.get_current_player_name() in self.parent.bots
+        )
+
+    def play_bot_turn(self) -> None:
+        """
+        Let the bot of the current player place the tile and a meeple
+
+        The bot thinks in the background on a copy of the game, so the window stays responsive;
+        the move is made in the first frame after the bot has chosen it
+        """
+        game = self.parent.game
+        if self.botMove is None:
+            policy = self.parent.bots[game.get_current_player_name()]
+            self.botMove = self.parent.botExecutor.submit(_think, policy, game.clone())
+            return
+        if not self.botMove.done():
+            return
+
+        coords, rotation, meeple = self.botMove.result()
+        self.botMove = None
+        game.place_tile(coords, (rotation - game.tileset[-1].rotation) % 4)
+        self.board.update_tile(game.lastTile, coords.to_tuple())
+        self.board.tile_to_place = None
+        self.phase = 1
+
+        game.placeMeeple(meeple)
+        self.clear()
+        self.after_meeple()
+
+    def after_meeple(self) -> None:
+        """Redraw tiles changed by placing a meeple and go to the next turn (or the end)"""
+        tilesChanged = [x.coords for x in self.parent.game.tilesChanged]
+        for tile in tilesChanged:
+            self.board.board[tile.to_tuple()].render()
+        self.board.board[self.board.lastPos].render()
+        if self.handleEnd():
+            return
+        self.phase = 0
+        self.meeplePointer = -1
+        self.board.set_tile_to_place(self.parent.game.get_current_tile())
+
     def handleEnd(self) -> bool:
         """Handle the game end: tell the game logic and hide ui elements"""
         if not self.parent.game.is_finished():
@@ -231,16 +394,21 @@ class GameScene(Scene):
                 self.board.tile_to_place.on_resize()
         elif event.type == KEYDOWN:
             if event.key == K_r:
-                if self.phase == 0 and self.board.tile_to_place is not None:
+                if (
+                    self.phase == 0
+                    and self.board.tile_to_place is not None
+                    and not self.is_bot_turn()
+                ):
                     self.parent.game.tileset[-1].rotate(1)
                     self.board.tile_to_place.render()
-                    self.clear()
             elif event.key == K_TAB:
                 if self.phase == 1:
                     self.meeplePointer += 1
                     if self.meeplePointer == len(self.parent.game.lastTile.features):
                         self.meeplePointer = -1
         elif event.type == MOUSEBUTTONUP and event.button == 1:
+            if self.is_bot_turn():
+                return
             if self.phase == 0 and self.board.tile_to_place is not None:
                 self.board.tile_to_place.coords = alignMousePosition(
                     event.pos,
@@ -256,24 +424,13 @@ class GameScene(Scene):
                     self.phase = 1
                     self.meeplePointer = -1
                 except Exception as e:
-                    print("Can't place tile")
-                    print(e)
-                    traceback.print_exc()
+                    _trace.info("can't place tile: %s", e, exc_info=True)
             elif self.phase == 1:
                 try:
                     self.parent.game.placeMeeple(self.meeplePointer)
-                    tilesChanged = [x.coords for x in self.parent.game.tilesChanged]
-                    for tile in tilesChanged:
-                        self.board.board[tile.to_tuple()].render()
-                    self.board.board[self.board.lastPos].render()
-                    if self.handleEnd():
-                        return
-                    self.phase = 0
-                    self.board.set_tile_to_place(self.parent.game.get_current_tile())
+                    self.after_meeple()
                 except Exception as e:
-                    print("Can't place meeple")
-                    print(e)
-                    traceback.print_exc()
+                    _trace.info("can't place meeple: %s", e, exc_info=True)
 
 
 class EndScene(Scene):
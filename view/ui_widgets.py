@@ -1,18 +1,18 @@
 from pygame.locals import *
 import pygame as pg
 from abc import abstractmethod
+import math
 from logic.tile import Tile
-import numpy as np
-from logic.const import FEATURE_TYPES
-from view.const import COLORS
-from view.utils import deCornify
-from copy import copy
+from view.atlas import TileAtlas
 import pygame_gui as gui
 from typing import TYPE_CHECKING
+from logic.trace import get_tracer
 
 if TYPE_CHECKING:
     from view.scenes import Scene
 
+_trace = get_tracer("view.widgets")
+
 
 class UIWidget(object):
     """Abstract class for custom UI widgets"""
@@ -57,14 +57,23 @@ class TextWidget(UIWidget):
 
 
 class BoardWidget(UIWidget):
-    """Widget containing tiles on the board and handling the placing of tiles and meeples (basically coordinating the Tile widgets)"""
+    """
+    Widget containing tiles on the board and handling the placing of tiles and meeples (basically coordinating the Tile widgets)
+
+    The tiles are kept by their position on the grid, so the tiles on a part of the screen are found
+    by looking up the cells under it, and only the tiles on screen are drawn and placed again after zooming
+    """
 
     def __init__(self, parent: "Scene", tile_size: int) -> None:
         super().__init__(parent, (0, 0))
         self.board = dict()
         self.tile_size = tile_size
+        self.atlas = TileAtlas(tile_size)
         self.tile_to_place = None
         self.lastPos = (0, 0)
+        self.changed = set()
+        self.cursor_rect = None
+        self.layout = 0
 
     def set_tile_to_place(self, tile_to_place) -> None:
         self.tile_to_place = TileWidget(tile_to_place, (0, 0), self.tile_size, self)
@@ -73,20 +82,83 @@ class BoardWidget(UIWidget):
         self.board[pos] = TileWidget(new_tile, pos, self.tile_size, self)
         self.lastPos = pos
 
-    def draw(self) -> None:
-        if self.tile_to_place is not None:
-            self.parent.clear()
+    def tile_changed(self, tile: "TileWidget") -> None:
+        """Draw the tile again in the next frame"""
+        self.changed.add(tile)
 
-        for tile in self.board.values():
-            tile.draw()
+    def redraw(self, rect: pg.Rect) -> None:
+        """Draw the tiles under a part of the screen again the next time the board is drawn"""
+        self.changed.update(self._tiles_in(rect))
 
-        if self.tile_to_place is not None:
-            self.tile_to_place.draw()
+    def _tiles_in(self, rect: pg.Rect) -> list["TileWidget"]:
+        """Get the tiles on the board overlapping a part of the screen (in time independent of the size of the board)"""
+        x, y = self.parent.parent.screen.get_size()
+        realSize = self._get_real_size()
+        first = (
+            math.floor((rect.left - x / 2) / realSize + 0.5),
+            math.floor((rect.top - y / 2) / realSize + 0.5),
+        )
+        last = (
+            math.floor((rect.right - 1 - x / 2) / realSize + 0.5),
+            math.floor((rect.bottom - 1 - y / 2) / realSize + 0.5),
+        )
+        if (last[0] - first[0] + 1) * (last[1] - first[1] + 1) > len(self.board):
+            # zoomed out so far that there are fewer tiles than cells on screen
+            return [
+                tile
+                for (i, j), tile in self.board.items()
+                if first[0] <= i <= last[0] and first[1] <= j <= last[1]
+            ]
+        tiles = []
+        for i in range(first[0], last[0] + 1):
+            for j in range(first[1], last[1] + 1):
+                tile = self.board.get((i, j))
+                if tile is not None:
+                    tiles.append(tile)
+        return tiles
+
+    def draw(self) -> None:
+        """Draw the tiles changed since the last frame (all of them if the screen was cleared) and the tile to place"""
+        scene = self.parent
+        cursor = self.tile_to_place
+        screen = self.parent.parent.screen.get_rect()
+        if scene.dirty is None:
+            self.changed.clear()
+            for tile in self._tiles_in(screen):
+                tile.draw()
+            if cursor is not None:
+                cursor.draw()
+            self.cursor_rect = None if cursor is None else cursor.get_rect()
+            return
+
+        if self.cursor_rect is not None and (cursor is None or cursor in self.changed):
+            # erase the tile to place where it was drawn last
+            scene.erase(self.cursor_rect)
+            self.redraw(self.cursor_rect)
+            self.cursor_rect = None
+
+        for tile in self.changed:
+            # skip the tiles to place that have been replaced since and the tiles off screen
+            if self.board.get(tile.coords) is tile and screen.colliderect(
+                tile.get_rect()
+            ):
+                tile.draw()
+                scene.mark_dirty(tile.get_rect())
+        self.changed.clear()
+
+        if cursor is not None and (
+            self.cursor_rect is None or scene.is_dirty(self.cursor_rect)
+        ):
+            cursor.draw()
+            self.cursor_rect = cursor.get_rect()
+            scene.mark_dirty(self.cursor_rect)
 
     def on_resize(self) -> None:
         self.parent.clear()
-        for tile in self.board.values():
-            tile.on_resize()
+        # tiles are placed again when they are drawn
+        self.layout += 1
+        if self.tile_to_place is not None:
+            self.tile_to_place.on_resize()
 
     def _get_real_size(self) -> float:
         return self.parent.boardZoom * self.tile_size
@@ -100,124 +172,63 @@ class TileWidget(UIWidget):
         self.tile = tile
         self.tile_size = size
         self.coords = pos
+        self.key = None
         self.img = None
         self.rect = None
-        self.feature_points = []
+        self.feature_points = ()
+        self.scaled = None
+        self.layout = None
         self.render()
         self.on_resize()
 
-    def _connection_pos(self, conn) -> tuple:
-        number = conn.to_number()
-        return [
-            (x * self.tile_size, y * self.tile_size)
-            for (x, y) in [
-                (0, 1),
-                (0, 1 / 2),
-                (0, 0),
-                (0, 0),
-                (1 / 2, 0),
-                (1, 0),
-                (1, 0),
-                (1, 1 / 2),
-                (1, 1),
-                (1, 1),
-                (1 / 2, 1),
-                (0, 1),
-            ]
-        ][number]
-
     def render(self) -> None:
-        """Draw the tile image and remember it"""
-        self.img = pg.Surface((self.tile_size, self.tile_size))
-        self.img.fill(COLORS.FARM)
-
+        """Get the tile image (with meeples) from the atlas of the board and remember it"""
+        self.scaled = None
+        self.key, self.img, self.feature_points = self.parent.atlas.get_image(
+            self.tile
+        )
         self.rect = self.img.get_rect()
+        self.parent.tile_changed(self)
 
-        self.feature_points = []
-        cloisterOnTile = any(
-            [feature.type == FEATURE_TYPES.CLOISTER for feature in self.tile.features]
-        )
-        for feature in self.tile.features:
-            conns = feature.connections
-            points = []
-            middle_point = (self.tile_size / 2, self.tile_size / 2)
-            if len(conns) > 0:
-                points = [self._connection_pos(c) for c in conns]
-
-            if feature.type == FEATURE_TYPES.CLOISTER:
-                pg.draw.circle(
-                    self.img, COLORS.CLOISTER, middle_point, self.tile_size / 4, 0
-                )
-                self.feature_points.append(copy(middle_point))
-            elif (
-                feature.type == FEATURE_TYPES.CITY
-                or feature.type == FEATURE_TYPES.PENNANT_CITY
-            ):
-                additional_point = tuple(np.average([*points, middle_point], axis=0))
-
-                if additional_point != middle_point:
-                    points.append(additional_point)
-                else:
-                    if len(points) == 6:
-                        points.insert(
-                            3, np.average([points[2], points[3], middle_point], axis=0)
-                        )
-                        points.append(
-                            np.average([points[6], points[0], middle_point], axis=0)
-                        )
-
-                col = COLORS.CITY
-                if feature.type == FEATURE_TYPES.PENNANT_CITY:
-                    col = COLORS.PENNANT_CITY
-                pg.draw.polygon(self.img, col, points, 0)
-
-                self.feature_points.append(tuple(np.average(points, axis=0)))
-            elif feature.type == FEATURE_TYPES.ROAD:
-                if len(points) == 1:
-                    points.append(middle_point)
-
-                pg.draw.line(self.img, COLORS.ROAD, points[0], points[1], 5)
-
-                self.feature_points.append(tuple(np.average(points, axis=0)))
-            elif feature.type == FEATURE_TYPES.FARM:
-                # already the green background
-                if cloisterOnTile:
-                    self.feature_points.append(
-                        (1 / 4 * self.tile_size, 1 / 4 * self.tile_size)
-                    )
-                else:
-                    self.feature_points.append(tuple(np.average(points, axis=0)))
-            else:
-                raise ValueError("Incorrect feature type")
-
-            if feature.meeple is not None:
-                meeple_pos = self.feature_points[-1]
-                x, y = deCornify(meeple_pos, self.tile_size)
-                pg.draw.rect(
-                    self.img, feature.meeple.color, ((x - 10, y - 10), (20, 20))
-                )
-
-        print(f"Rendering tile done: {self.feature_points}")
+    def get_rect(self) -> pg.Rect:
+        """Get the part of the screen covered by the tile"""
+        self.update_layout()
+        realSize = int(self._get_real_size())
+        return pg.Rect(self.pos, (realSize, realSize))
 
     def _get_real_size(self) -> float:
         """Get the de facto size of the tile on screen (taking zoom into account)"""
         return self.parent.parent.boardZoom * self.tile_size
 
     def draw(self) -> None:
-        realSize = self._get_real_size()
-        self.get_screen().blit(
-            pg.transform.scale(self.img, (realSize, realSize)), self.pos
-        )
-
-    def on_resize(self) -> None:
+        self.update_layout()
+        if self.scaled is None:
+            self.scaled = self.parent.atlas.get_scaled(
+                self.key, self.img, int(self._get_real_size())
+            )
+        self.get_screen().blit(self.scaled, self.pos)
+
+    def update_layout(self) -> None:
+        """Place the tile on screen again if the board has been zoomed or resized since it was placed"""
+        if self.layout != self.parent.layout:
+            self._place()
+
+    def _place(self) -> None:
         x, y = self.get_screen().get_size()
         x /= 2
         y /= 2
         realSize = self._get_real_size()
+        # the zoom may have changed, pick the image of the current size on the next draw
+        self.scaled = None
         self.pos = (
             x + self.coords[0] * realSize - realSize / 2,
             y + self.coords[1] * realSize - realSize / 2,
         )
+        self.layout = self.parent.layout
+
+    def on_resize(self) -> None:
+        self._place()
+        self.parent.tile_changed(self)
 
 
 class InfoWidget(UIWidget):
@@ -255,28 +266,37 @@ class PlayerWidget(UIWidget):
         self.player = player
 
         self.color_rect = None
+        self.text = self._get_text()
         self.label = gui.elements.UILabel(
             pg.Rect(50, self.pos[1], 150, 50),
-            f"{self.name} | {self.player.meeplesLeft} | {self.player.score}",
+            self.text,
             self.parent.parent.parent.ui_manager,
         )
         self.label.set_text_scale(2)
 
         self.render()
 
+    def _get_text(self) -> str:
+        return f"{self.name} | {self.player.meeplesLeft} | {self.player.score}"
+
     def set_label(self) -> None:
-        self.label.set_text(
-            f"{self.name} | {self.player.meeplesLeft} | {self.player.score}"
-        )
+        """Update the label if the meeples or the score of the player changed"""
+        text = self._get_text()
+        if text != self.text:
+            self.text = text
+            self.label.set_text(text)
 
     def render(self) -> None:
         self.color_rect = pg.Surface((50, 50))
         pg.draw.rect(self.color_rect, self.color, pg.Rect(0, 0, 50, 50))
 
     def draw(self) -> None:
-        screen = self.get_screen()
+        scene = self.parent.parent
         self.set_label()
-        screen.blit(self.color_rect, (0, self.pos[1]))
+        rect = pg.Rect(0, self.pos[1], 50, 50)
+        if scene.is_dirty(rect):
+            self.get_screen().blit(self.color_rect, rect.topleft)
+            scene.mark_dirty(rect)
 
     def hide(self) -> None:
         self.label.hide()